@@ -0,0 +1,107 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionBuffer:
+    """
+    Write-behind buffer for model instances.
+
+    Requests only append to an in-memory list; a background thread writes the
+    rows with one bulk_create once `max_size` are pending or `max_delay`
+    seconds have passed, whichever comes first, and again at interpreter exit.
+    Concurrent requests therefore no longer queue on SQLite's write lock.
+    """
+
+    def __init__(self, model, max_size=100, max_delay=2.0, max_pending=10000):
+        self.model = model
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.written = 0
+        self.dropped = 0
+
+    def add(self, instance):
+        with self._lock:
+            self._pending.append(instance)
+            full = len(self._pending) >= self.max_size
+            self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self):
+        # Threads do not survive a fork: start one per worker process
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='prediction-buffer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.max_delay)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """Write every pending instance now; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self.model.objects.bulk_create(batch, batch_size=500)
+            except DatabaseError:
+                logger.exception("Could not write %d %s rows", len(batch), self.model.__name__)
+                with self._lock:
+                    # Keep them for the next attempt, within bounds
+                    pending = batch + self._pending
+                    self.dropped += max(0, len(pending) - self.max_pending)
+                    self._pending = pending[-self.max_pending:]
+                return 0
+            self.written += len(batch)
+            return len(batch)
+
+    def __len__(self):
+        return len(self._pending)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            from .models import Prediction
+
+            _buffer = PredictionBuffer(
+                Prediction,
+                max_size=getattr(settings, 'PREDICTION_BUFFER_SIZE', 100),
+                max_delay=getattr(settings, 'PREDICTION_BUFFER_FLUSH_SECONDS', 2.0),
+            )
+            # Shutdown flush: rows still pending when the worker exits
+            atexit.register(_buffer.flush)
+        return _buffer
+
+
+def save_prediction(instance):
+    """Persist a Prediction, through the write-behind buffer unless disabled."""
+    if getattr(settings, 'PREDICTION_BUFFER_ENABLED', True):
+        get_buffer().add(instance)
+    else:
+        instance.save()
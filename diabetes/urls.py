@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import predict_diabetes
+from .views import predict_diabetes, predict_diabetes_batch
 
 urlpatterns = [
     path('predict/', predict_diabetes, name='predict_diabetes'),
+    path('predict/batch/', predict_diabetes_batch, name='predict_diabetes_batch'),
 ]
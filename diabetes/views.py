@@ -1,29 +1,12 @@
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn import svm
 from django.shortcuts import render
+from django.views.decorators.http import require_POST
+from website.decorators import api_login_required
+from website import artifacts, batch, prediction_cache
+from .buffer import save_prediction
 from .forms import PredictionForm
 from .models import Prediction
 
-# Initialize model and scaler once
-scaler = None
-classifier = None
-
-def initialize_model():
-    global scaler, classifier
-    diabetes_dataset = pd.read_csv('diabetes.csv')  # Update with correct path
-    X = diabetes_dataset.drop(columns='Outcome', axis=1)
-    Y = diabetes_dataset['Outcome']
-    
-    scaler = StandardScaler()
-    scaler.fit(X)
-    
-    classifier = svm.SVC(kernel='linear')
-    classifier.fit(scaler.transform(X), Y)
-
-# Initialize model and scaler
-initialize_model()
+LABELS = {0: 'Not Diabetic', 1: 'Diabetic'}
 
 def predict_diabetes(request):
     result = None
@@ -40,18 +23,27 @@ def predict_diabetes(request):
                 form.cleaned_data['diabetes_pedigree_function'],
                 form.cleaned_data['age']
             ]
-            input_data_as_numpy_array = np.asarray(data).reshape(1, -1)
-            std_data = scaler.transform(input_data_as_numpy_array)
-            prediction = classifier.predict(std_data)
-            result = 'Diabetic' if prediction[0] == 1 else 'Not Diabetic'
+            explanation = prediction_cache.explain(artifacts.get('diabetes'), data)
+            result = LABELS[explanation['prediction']]
 
-            # Save the prediction
-            Prediction.objects.create(
+            # Save the prediction (written in bulk by the background buffer)
+            save_prediction(Prediction(
                 input_data=data,
                 result=result
-            )
-            return render(request, 'diabetes/predict.html', {'form': form, 'result': result})
+            ))
+            return render(request, 'diabetes/predict.html', {
+                'form': form,
+                'result': result,
+                'probability': explanation['probability'],
+                'contributions': list((explanation['contributions'] or {}).items())[:5],
+            })
     else:
         form = PredictionForm()
     return render(request, 'diabetes/predict.html', {'form': form, 'result': result})
-    
\ No newline at end of file
+
+@require_POST
+@api_login_required
+def predict_diabetes_batch(request):
+    """Score many rows at once: a JSON list or CSV with the diabetes.csv
+    column names (Pregnancies, Glucose, ...)."""
+    return batch.predict_response(request, artifacts.get('diabetes'), LABELS)
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -151,6 +152,139 @@ LOGGING = {
     },
 }
 
+# Summarization models
+# Loaded once per process through sumapp.registry; set SUMMARIZER_WARMUP to
+# load them at startup instead of on the first request.
+SUMMARIZER_MODEL_NAME = 'facebook/bart-large-cnn'
+SUMMARIZER_WARMUP = False
+
+# Inference backend: 'torch' (fp32), 'torch-int8' (dynamically quantized) or
+# 'onnx' (ONNX Runtime; export first with `manage.py export_onnx_summarizer`).
+SUMMARIZER_BACKEND = 'torch'
+SUMMARIZER_ONNX_DIR = os.path.join(BASE_DIR, 'media', 'models', 'bart-onnx')
+
+# Chunks are summarized in padded batches: at most SUMMARIZER_BATCH_SIZE
+# chunks per model.generate call, and at most SUMMARIZER_MAX_BATCH_TOKENS
+# input tokens (rows * longest row) per batch to bound CPU memory.
+SUMMARIZER_BATCH_SIZE = 4
+SUMMARIZER_MAX_BATCH_TOKENS = 8192
+
+# Named model.generate settings. Uploads pick one with the "profile" form
+# field (also accepted by the upload API); batch jobs can use "quality".
+SUMMARIZER_PROFILES = {
+    'fast': {'num_beams': 1, 'max_length': 96, 'min_length': 20},
+    'balanced': {'num_beams': 2, 'max_length': 128, 'min_length': 30, 'length_penalty': 2.0, 'early_stopping': True},
+    'quality': {'num_beams': 4, 'max_length': 150, 'min_length': 40, 'length_penalty': 2.0, 'early_stopping': True},
+}
+SUMMARIZER_DEFAULT_PROFILE = 'quality'
+
+# Documents are cut into token chunks on sentence boundaries; each chunk
+# repeats up to SUMMARIZER_CHUNK_OVERLAP tokens of the previous one.
+SUMMARIZER_CHUNK_OVERLAP = 0
+
+# "map_reduce" summarizes the chunk summaries again until the result fits in
+# SUMMARIZER_TARGET_TOKENS; "concat" just joins the chunk summaries. The map
+# stage runs on SUMMARIZER_MAP_WORKERS threads sharing the one model.
+SUMMARIZER_MODE = 'map_reduce'
+SUMMARIZER_TARGET_TOKENS = 512
+SUMMARIZER_MAP_WORKERS = 2
+
+# Key-point NER: a NER-only spaCy pipeline shared through sumapp.registry.
+# Sentences go through nlp.pipe in batches of SPACY_NER_BATCH_SIZE.
+SPACY_MODEL_NAME = 'en_core_web_sm'
+SPACY_NER_BATCH_SIZE = 64
+
+# PDF text extraction (sumapp.ingest, PyMuPDF). Documents with at least
+# PDF_PARALLEL_MIN_PAGES pages are split into one page range per each of
+# PDF_EXTRACT_WORKERS processes, which open the file by path.
+PDF_PARALLEL_MIN_PAGES = 64
+PDF_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Summary jobs are queued in the database (the SummaryJob table). By default
+# each web process drains the queue with SUMMARY_JOB_WORKERS threads; set
+# SUMMARY_JOB_RUN_IN_PROCESS = False to leave that to `manage.py run_summary_worker`.
+# In-process, every web process also sweeps the queue from its first request
+# and then every SUMMARY_JOB_RECOVERY_INTERVAL seconds. The sweep picks up jobs
+# still queued after a restart. It also requeues running jobs whose worker has
+# not reported progress for SUMMARY_JOB_STALE_SECONDS.
+SUMMARY_JOB_WORKERS = 2
+SUMMARY_JOB_RUN_IN_PROCESS = True
+SUMMARY_JOB_RECOVERY_INTERVAL = 60
+SUMMARY_JOB_STALE_SECONDS = 900
+
+# /upload/jobs/<id>/stream/ follows a job as Server-Sent Events, re-reading its
+# row every SUMMARY_JOB_STREAM_POLL_SECONDS; the upload page uses it by default.
+# Served through frontend.asgi it is one open stream per viewer; under WSGI each
+# request returns what is new and the browser reconnects (at least a second apart).
+SUMMARY_JOB_STREAM_POLL_SECONDS = 0.5
+
+# Finished summaries are cached by the SHA-256 of the PDF bytes plus the
+# model/generation parameters (sumapp.cache). Entries older than the max age
+# expire; beyond the entry/byte limits the least recently used go first.
+SUMMARY_CACHE_MAX_ENTRIES = 1000
+SUMMARY_CACHE_MAX_BYTES = 50 * 1024 * 1024
+SUMMARY_CACHE_MAX_AGE = timedelta(days=30)
+
+# Symptom recommender knowledge base (recommender.knowledge). Workers check the
+# file's mtime at most every RECOMMENDER_KB_CHECK_INTERVAL seconds and rebuild
+# their indexes when it changes; `manage.py reload_symptoms` validates and touches it.
+RECOMMENDER_KNOWLEDGE_BASE = os.path.join(BASE_DIR, 'recommender', 'data', 'knowledge_base.json')
+RECOMMENDER_KB_CHECK_INTERVAL = 5
+
+# Conditions are ranked by the summed weights of the matched symptoms linking
+# to them; the recommender returns the RECOMMENDER_TOP_K best.
+RECOMMENDER_TOP_K = 5
+
+# Correct typos ("hedache", "diarhea") against the symptom vocabulary before
+# matching: words of 5+ letters within 1 edit (2 for 9+ letters) of a known word.
+# Words listed in the RECOMMENDER_LEXICON files (missing files are skipped) are
+# real English and never corrected, so "tough" does not become "cough".
+RECOMMENDER_FUZZY_MATCHING = True
+RECOMMENDER_LEXICON = [
+    os.path.join(BASE_DIR, 'recommender', 'data', 'english_words.txt'),
+    '/usr/share/dict/words',
+]
+
+# Speech-to-text for the recommender (recommender.speech): 'google' (Web Speech
+# API, needs network) or 'vosk' (local CPU model from VOSK_MODEL_PATH, loaded
+# once per process). Audio is fed to the backend in RECOMMENDER_SPEECH_CHUNK_SECONDS
+# chunks; latency figures are served at /recommender/speech/metrics/.
+RECOMMENDER_SPEECH_BACKEND = 'google'
+RECOMMENDER_SPEECH_CHUNK_SECONDS = 0.5
+VOSK_MODEL_PATH = os.path.join(BASE_DIR, 'media', 'models', 'vosk-model-small-en-us-0.15')
+
+# /recommender/speech/stream/ (async; serve through frontend.asgi) decodes on
+# RECOMMENDER_SPEECH_WORKERS threads and takes at most RECOMMENDER_SPEECH_MAX_STREAMS
+# recordings at a time per process.
+RECOMMENDER_SPEECH_WORKERS = 2
+RECOMMENDER_SPEECH_MAX_STREAMS = 4
+
+# Diabetes and heart classifiers (website.artifacts). `manage.py train_models`
+# writes versioned, checksummed joblib artifacts here; workers load the current
+# version at startup (memory-mapped) instead of retraining on every boot.
+MODEL_ARTIFACTS_DIR = os.path.join(BASE_DIR, 'media', 'models', 'artifacts')
+MODEL_ARTIFACTS_PRELOAD = True
+
+# Batch scoring endpoints (/diabetes/predict/batch/, /heart/batch/) accept up
+# to PREDICTION_BATCH_MAX_ROWS JSON or CSV rows per request. Like /upload/batch/
+# they take HTTP Basic credentials, or a browser session plus the csrftoken
+# cookie's value in an X-CSRFToken header (website.decorators.api_login_required).
+PREDICTION_BATCH_MAX_ROWS = 50000
+
+# Diabetes predictions are saved write-behind (diabetes.buffer): rows are
+# bulk-inserted once PREDICTION_BUFFER_SIZE are pending or every
+# PREDICTION_BUFFER_FLUSH_SECONDS, and at shutdown. Disable to save each row inline.
+PREDICTION_BUFFER_ENABLED = True
+PREDICTION_BUFFER_SIZE = 100
+PREDICTION_BUFFER_FLUSH_SECONDS = 2.0
+
+# Single-row diabetes/heart results are cached per (model, version, features)
+# in each process (website.prediction_cache): LRU beyond
+# PREDICTION_CACHE_MAX_ENTRIES, expiring after PREDICTION_CACHE_TTL seconds.
+# Hit/miss/eviction counts are served at /predictions/metrics/.
+PREDICTION_CACHE_MAX_ENTRIES = 4096
+PREDICTION_CACHE_TTL = 300
+
 # Security settings (for production)
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
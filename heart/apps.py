@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class HeartConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "heart"
+
+    def ready(self):
+        # Load the trained artifact at boot instead of on the first prediction
+        if getattr(settings, 'MODEL_ARTIFACTS_PRELOAD', True):
+            from website import artifacts
+            artifacts.preload('heart')
@@ -1,23 +1,43 @@
-import numpy as np
+import os
+
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
 
-# Load the dataset
-heart_data = pd.read_csv('heart_disease_data.csv')
-x = heart_data.drop(columns='target', axis=1)
-y = heart_data['target']
+from website import artifacts, prediction_cache
+
+
+def train(data_dir):
+    """Fit the heart disease classifier on heart_disease_data.csv in `data_dir`."""
+    # utf-8-sig: the CSV starts with a byte-order mark
+    heart_data = pd.read_csv(os.path.join(data_dir, 'heart_disease_data.csv'), encoding='utf-8-sig')
+    x = heart_data.drop(columns='target', axis=1)
+    y = heart_data['target']
+
+    # Split the data
+    x_train, x_test, y_train, y_test = train_test_split(
+        x.to_numpy(dtype=float), y, test_size=0.2, stratify=y, random_state=2
+    )
+
+    # Train the model
+    model = LogisticRegression()
+    model.fit(x_train, y_train)
 
-# Split the data
-x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, stratify=y, random_state=2)
+    return {
+        'estimator': model,
+        'scaler': None,
+        'features': list(x.columns),
+        'metrics': {
+            'rows': len(x),
+            'train_accuracy': round(accuracy_score(y_train, model.predict(x_train)), 4),
+            'test_accuracy': round(accuracy_score(y_test, model.predict(x_test)), 4),
+        },
+        # Contributions are measured against the average training patient
+        'baseline': x_train.mean(axis=0),
+    }
 
-# Train the model
-model = LogisticRegression()
-model.fit(x_train, y_train)
 
 def predict_heart_disease(input_data):
-    input_data_as_numpy_array = np.asarray(input_data)
-    input_data_reshaped = input_data_as_numpy_array.reshape(1, -1)
-    prediction = model.predict(input_data_reshaped)
-    return prediction[0]
+    """Prediction, probability and per-feature contributions for one patient."""
+    return prediction_cache.explain(artifacts.get('heart'), input_data)
@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('', views.heart_view, name='heart'),
+    path('batch/', views.heart_batch, name='heart_batch'),
 ]
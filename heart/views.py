@@ -1,6 +1,11 @@
 from django.shortcuts import render
+from django.views.decorators.http import require_POST
+from website.decorators import api_login_required
+from website import artifacts, batch
 from .model import predict_heart_disease  
 
+LABELS = {0: 'The Person does not have Heart Disease', 1: 'The Person has Heart Disease'}
+
 def heart_view(request):
     if request.method == 'POST':
         input_data = [
@@ -19,8 +24,19 @@ def heart_view(request):
             request.POST['thal'],
         ]
         input_data = list(map(float, input_data))
-        prediction = predict_heart_disease(input_data)
-        result = 'The Person has Heart Disease' if prediction == 1 else 'The Person does not have Heart Disease'
-        return render(request, 'heart/result.html', {'result': result})
+        explanation = predict_heart_disease(input_data)
+        result = LABELS[explanation['prediction']]
+        return render(request, 'heart/result.html', {
+            'result': result,
+            'probability': explanation['probability'],
+            'contributions': list((explanation['contributions'] or {}).items())[:5],
+        })
+
+    return render(request, 'heart/index.html')
 
-    return render(request, 'heart/index.html')
\ No newline at end of file
+@require_POST
+@api_login_required
+def heart_batch(request):
+    """Score many rows at once: a JSON list or CSV with the
+    heart_disease_data.csv column names (age, sex, cp, ...)."""
+    return batch.predict_response(request, artifacts.get('heart'), LABELS)
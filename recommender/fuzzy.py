@@ -0,0 +1,109 @@
+from collections import Counter, defaultdict
+
+NGRAM = 3
+
+
+def read_lexicon(paths):
+    """Lowercase words from one-word-per-line files (such as /usr/share/dict/words);
+    missing files are skipped."""
+    words = set()
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8', errors='ignore') as file:
+                for line in file:
+                    word = line.strip().lower()
+                    if word.isalpha():
+                        words.add(word)
+        except FileNotFoundError:
+            continue
+    return words
+
+
+def ngrams(word, n=NGRAM):
+    padded = f'^{word}$'
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def bounded_distance(a, b, limit):
+    """Edit distance between `a` and `b` counting adjacent swaps as one edit
+    (optimal string alignment), or `limit + 1` once it must exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # Every later row only grows from this one's minimum
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellingCorrector:
+    """
+    Typo correction against a fixed vocabulary (the words of the symptom phrases).
+
+    A character n-gram inverted index narrows each unknown word down to the
+    few vocabulary words sharing enough n-grams to be within the allowed edit
+    distance, so only those are compared: a query never scans the whole
+    vocabulary.
+
+    Words in `lexicon` (ordinary English) are never corrected, so "tough" or
+    "never" stay as written.
+    """
+
+    def __init__(self, words, lexicon=(), min_length=5, cache_size=10000):
+        self.vocabulary = sorted(set(words))
+        self._known = set(self.vocabulary)
+        self.lexicon = frozenset(lexicon)
+        self._postings = defaultdict(list)
+        for index, word in enumerate(self.vocabulary):
+            for gram in set(ngrams(word)):
+                self._postings[gram].append(index)
+        self.min_length = min_length
+        self._cache = {}
+        self._cache_size = cache_size
+
+    def max_distance(self, word):
+        return 2 if len(word) >= 9 else 1
+
+    def correct_word(self, word):
+        """The closest vocabulary word to `word`, or `word` itself when it is
+        known, a real word, too short to correct safely, or has no close match."""
+        if word in self._known or len(word) < self.min_length or word in self.lexicon:
+            return word
+        try:
+            return self._cache[word]
+        except KeyError:
+            pass
+
+        limit = self.max_distance(word)
+        grams = ngrams(word)
+        # Each edit (a swap included) breaks at most NGRAM + 1 of the word's
+        # n-grams, so a match within `limit` edits shares at least this many
+        needed = max(1, len(grams) - (NGRAM + 1) * limit)
+        shared = Counter(index for gram in set(grams) for index in self._postings.get(gram, ()))
+
+        best, best_distance = word, limit + 1
+        for index, count in shared.most_common():
+            if count < needed:
+                break
+            distance = bounded_distance(word, self.vocabulary[index], min(limit, best_distance))
+            if distance < best_distance:
+                best, best_distance = self.vocabulary[index], distance
+                if distance == 1:
+                    break
+
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[word] = best
+        return best
+
+    def correct(self, tokens):
+        return [self.correct_word(token) for token in tokens]
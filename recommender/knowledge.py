@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import Signal
+from scipy import sparse
+
+from .fuzzy import SpellingCorrector, read_lexicon
+from .matcher import SymptomMatcher, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Sent with `knowledge_base` after the index is rebuilt from the data file
+knowledge_base_reloaded = Signal()
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'knowledge_base.json')
+DEFAULT_LEXICON = [
+    os.path.join(os.path.dirname(__file__), 'data', 'english_words.txt'),
+    '/usr/share/dict/words',
+]
+
+
+class KnowledgeBase:
+    """
+    In-memory indexes over the symptom knowledge base.
+
+    Conditions and symptoms are numbered in file order. `symptom_conditions`
+    holds the weighted condition list of each symptom (many-to-many), `weights`
+    is the same data as a sparse symptom x condition matrix, and `matcher`
+    finds symptom names and synonyms in free text, after `speller` has
+    corrected typos against the words they are made of. Words in `lexicon`
+    are real English and are never treated as typos.
+    """
+
+    def __init__(self, data, path=None, mtime=None, lexicon=None):
+        self.path = path
+        self.mtime = mtime
+        self.version = data.get('version')
+
+        self.conditions = []
+        self.condition_index = {}
+        diseases = set()
+        for condition in data['conditions']:
+            if condition['id'] in self.condition_index:
+                raise ValueError(f"Duplicate condition id '{condition['id']}'")
+            # One entry per disease: link more symptoms to it instead of repeating it
+            if condition['disease'].lower() in diseases:
+                raise ValueError(f"Duplicate condition '{condition['disease']}'")
+            diseases.add(condition['disease'].lower())
+            self.condition_index[condition['id']] = len(self.conditions)
+            self.conditions.append(condition)
+
+        self.symptoms = []
+        self.symptom_index = {}
+        self.symptom_conditions = []
+        phrases = []
+        for symptom in data['symptoms']:
+            name = symptom['name'].lower()
+            if name in self.symptom_index:
+                raise ValueError(f"Duplicate symptom '{name}'")
+            self.symptom_index[name] = len(self.symptoms)
+            self.symptoms.append(name)
+            self.symptom_conditions.append([
+                (self.condition_index[link['condition']], float(link.get('weight', 1.0)))
+                for link in symptom['conditions']
+            ])
+            phrases.append((name, name))
+            phrases.extend((synonym, name) for synonym in symptom.get('synonyms', []))
+
+        self.phrases = phrases
+        self.matcher = SymptomMatcher(phrases)
+        # Inflected forms are vocabulary too, so "coughng" becomes "coughing"
+        self.speller = SpellingCorrector(
+            [token for phrase, _ in phrases for token in tokenize(phrase)] + list(self.matcher.forms),
+            lexicon=get_lexicon() if lexicon is None else lexicon,
+        )
+
+        rows, cols, values = [], [], []
+        for symptom, links in enumerate(self.symptom_conditions):
+            for condition, weight in links:
+                rows.append(symptom)
+                cols.append(condition)
+                values.append(weight)
+        # Duplicate (symptom, condition) links are summed
+        self.weights = sparse.csr_matrix(
+            (np.array(values, dtype=np.float32), (rows, cols)),
+            shape=(len(self.symptoms), len(self.conditions)),
+        )
+
+    @classmethod
+    def from_file(cls, path, lexicon=None):
+        mtime = os.stat(path).st_mtime
+        with open(path, encoding='utf-8') as file:
+            return cls(json.load(file), path=path, mtime=mtime, lexicon=lexicon)
+
+    def correct(self, tokens):
+        """`tokens` with typos corrected, keeping only the corrections that
+        complete a symptom phrase; every other word is left as written."""
+        corrected = self.speller.correct(tokens)
+        if corrected == tokens:
+            return tokens
+        kept = list(tokens)
+        for _, start, end in self.matcher.find_iter(corrected):
+            kept[start:end] = corrected[start:end]
+        return kept
+
+    def match_symptoms(self, text, fuzzy=True):
+        """Distinct symptom names found in `text`, in order of first occurrence."""
+        tokens = tokenize(text)
+        if fuzzy:
+            tokens = self.correct(tokens)
+        return list(dict.fromkeys(key for key, _, _ in self.matcher.find_iter(tokens)))
+
+    def rank_conditions(self, symptoms, top_k=5):
+        """Score every condition against the given symptom names.
+
+        Scores are the summed weights of the matched symptoms linked to each
+        condition, computed in one pass over a sparse row slice of `weights`,
+        so the cost grows with the matched symptoms' links rather than with
+        the size of the catalog.
+        Returns up to `top_k` (condition, score) pairs, best first.
+        """
+        rows = [self.symptom_index[symptom] for symptom in symptoms]
+        if not rows:
+            return []
+        linked = self.weights[rows]
+        candidates, inverse = np.unique(linked.indices, return_inverse=True)
+        scores = np.bincount(inverse, weights=linked.data, minlength=len(candidates))
+        keep = scores > 0
+        candidates, scores = candidates[keep], scores[keep]
+        if len(candidates) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best.sort()
+            candidates, scores = candidates[best], scores[best]
+        # Stable sort: equal scores keep catalog order
+        order = np.argsort(-scores, kind='stable')
+        candidates, scores = candidates[order], scores[order]
+        return [(self.conditions[condition], float(score)) for condition, score in zip(candidates, scores)]
+
+
+_knowledge_base = None
+_last_checked = 0.0
+_lock = threading.Lock()
+_lexicon = {}
+
+
+def get_lexicon():
+    """English words from the RECOMMENDER_LEXICON files, read once per process."""
+    paths = tuple(getattr(settings, 'RECOMMENDER_LEXICON', DEFAULT_LEXICON))
+    if paths not in _lexicon:
+        _lexicon[paths] = frozenset(read_lexicon(paths))
+    return _lexicon[paths]
+
+
+def knowledge_base_path():
+    return getattr(settings, 'RECOMMENDER_KNOWLEDGE_BASE', DEFAULT_PATH)
+
+
+def reload():
+    """Rebuild the index from the data file and notify listeners."""
+    global _knowledge_base, _last_checked
+    with _lock:
+        knowledge_base = KnowledgeBase.from_file(knowledge_base_path())
+        _knowledge_base = knowledge_base
+        _last_checked = time.monotonic()
+    logger.info("Loaded symptom knowledge base: %d conditions, %d symptoms",
+                len(knowledge_base.conditions), len(knowledge_base.symptoms))
+    knowledge_base_reloaded.send(sender=KnowledgeBase, knowledge_base=knowledge_base)
+    return knowledge_base
+
+
+def get_knowledge_base():
+    """Return the current index, rebuilding it when the data file has changed.
+
+    The file's mtime is checked at most every RECOMMENDER_KB_CHECK_INTERVAL
+    seconds, so editing (or touching) the file reloads every worker without
+    a restart. A file that fails to load keeps the previous index in place.
+    """
+    global _last_checked
+    knowledge_base = _knowledge_base
+    if knowledge_base is None:
+        return reload()
+
+    interval = getattr(settings, 'RECOMMENDER_KB_CHECK_INTERVAL', 5)
+    if time.monotonic() - _last_checked < interval:
+        return knowledge_base
+    _last_checked = time.monotonic()
+    try:
+        if os.stat(knowledge_base.path).st_mtime != knowledge_base.mtime:
+            return reload()
+    except (OSError, ValueError, KeyError):
+        logger.exception("Could not reload the symptom knowledge base; keeping the current one")
+    return knowledge_base
@@ -0,0 +1,35 @@
+# recommender/management/commands/reload_symptoms.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recommender.knowledge import KnowledgeBase, knowledge_base_path
+
+
+class Command(BaseCommand):
+    help = 'Validate the symptom knowledge base and make running workers reload it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only validate the file; do not trigger a reload')
+
+    def handle(self, *args, **options):
+        path = knowledge_base_path()
+        started = time.perf_counter()
+        try:
+            knowledge_base = KnowledgeBase.from_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Invalid knowledge base {path}: {e}")
+        elapsed = (time.perf_counter() - started) * 1000
+
+        links = sum(len(conditions) for conditions in knowledge_base.symptom_conditions)
+        self.stdout.write(
+            f"{len(knowledge_base.conditions)} conditions, {len(knowledge_base.symptoms)} symptoms, "
+            f"{len(knowledge_base.phrases)} phrases, {links} symptom-condition links; indexed in {elapsed:.1f}ms"
+        )
+        if options['check']:
+            return
+
+        # Workers reload when the mtime changes, within RECOMMENDER_KB_CHECK_INTERVAL
+        os.utime(path)
+        self.stdout.write(self.style.SUCCESS(f"Touched {path}; workers will reload it"))
@@ -0,0 +1,115 @@
+import re
+from collections import deque
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+def inflections(word):
+    """Regular -s/-es/-ing/-ed forms of `word`, and of its stem when `word`
+    is itself an -ing or plural form: "cough" gives "coughs", "coughing" and
+    "coughed"; "vomiting" gives "vomit", "vomits" and "vomited"."""
+    if len(word) < 3 or not word.isalpha():
+        return set()
+    stems = {word}
+    if word.endswith('ing') and len(word) > 5:
+        base = word[:-3]
+        stems.update((base, base + 'e'))
+        if base[-1] == base[-2]:
+            stems.add(base[:-1])
+    elif word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        stems.add(word[:-1])
+        if word.endswith(('ses', 'xes', 'zes', 'ches', 'shes')):
+            stems.add(word[:-2])
+
+    forms = set(stems)
+    for stem in stems:
+        if stem.endswith('y') and stem[-2] not in 'aeiou':
+            forms.update((stem[:-1] + 'ies', stem[:-1] + 'ied', stem + 'ing'))
+            continue
+        forms.add(stem + 'es' if stem.endswith(('s', 'x', 'z', 'ch', 'sh')) else stem + 's')
+        base = stem[:-1] if stem.endswith('e') else stem
+        forms.update((base + 'ing', base + 'ed'))
+    forms.discard(word)
+    return forms
+
+
+class SymptomMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Patterns are symptom phrases (and synonyms), each mapped to a key. Matching
+    works on whole words, so "pain" never fires inside "painful", and finds
+    every pattern occurrence in a single left-to-right pass over the input,
+    however many patterns there are. Regular inflections of the pattern words
+    are read as the words themselves, so "coughing" matches "cough" and
+    "rashes" matches "rash".
+    """
+
+    def __init__(self, phrases):
+        """`phrases` is an iterable of (phrase, key) pairs."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for phrase, key in phrases:
+            self._add(tokenize(phrase), key)
+        self._link()
+
+        # Pattern words always stand for themselves; a form shared by two
+        # words goes to the first in sorted order
+        words = {token for edges in self._goto for token in edges}
+        self.forms = {}
+        for word in sorted(words):
+            for form in inflections(word):
+                if form not in words:
+                    self.forms.setdefault(form, word)
+
+    def _add(self, tokens, key):
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        self._out[node].append((key, len(tokens)))
+
+    def _link(self):
+        # Breadth-first: a node's failure link points at the longest proper
+        # suffix of its path that is also a path in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_iter(self, tokens):
+        """Yield (key, start, end) token spans for every match in `tokens`."""
+        node = 0
+        for position, token in enumerate(tokens):
+            token = self.forms.get(token, token)
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for key, length in self._out[node]:
+                yield key, position - length + 1, position + 1
+
+    def match(self, text):
+        """Distinct keys found in `text`, in order of first occurrence."""
+        return list(dict.fromkeys(key for key, _, _ in self.find_iter(tokenize(text))))
+
+    def __len__(self):
+        return len(self._goto)
@@ -0,0 +1,283 @@
+import audioop
+import json
+import os
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from sumapp import registry
+
+# Speech-to-text backends. A backend is a session class: start one per
+# recording with its sample rate, feed it 16-bit mono PCM chunks through
+# accept(), then call finish() for the full transcript. accept() returns the
+# text of any utterance it finalized, so callers can show partial results.
+# Failures raise speech_recognition's UnknownValueError / RequestError.
+
+
+def vosk_model_path():
+    return getattr(settings, 'VOSK_MODEL_PATH', os.path.join(settings.BASE_DIR, 'media', 'models', 'vosk-model-small-en-us-0.15'))
+
+
+def _load_vosk():
+    try:
+        from vosk import Model, SetLogLevel
+    except ImportError:
+        raise ImproperlyConfigured("The 'vosk' speech backend needs the vosk package installed.")
+
+    path = vosk_model_path()
+    if not os.path.isdir(path):
+        raise ImproperlyConfigured(
+            f"No Vosk model in {path}; download one from https://alphacephei.com/vosk/models and set VOSK_MODEL_PATH."
+        )
+    SetLogLevel(-1)
+    return Model(path)
+
+
+# One model per process, shared by every recognizer (it is read-only)
+registry.register('vosk', _load_vosk)
+
+
+class LatencyStats:
+    """Rolling latency figures for one backend over its last `window` recordings."""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._processing = deque(maxlen=window)
+        self._final = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+        self.audio_seconds = 0.0
+        self.processing_seconds = 0.0
+
+    def record(self, audio_seconds, processing_seconds, final_seconds, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.failures += failed
+            self.audio_seconds += audio_seconds
+            self.processing_seconds += processing_seconds
+            self._processing.append(processing_seconds)
+            self._final.append(final_seconds)
+
+    @staticmethod
+    def _percentile(values, fraction):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'failures': self.failures,
+                'audio_seconds': round(self.audio_seconds, 2),
+                # Processing time per second of audio; below 1 is faster than real time
+                'real_time_factor': round(self.processing_seconds / self.audio_seconds, 4) if self.audio_seconds else None,
+                'processing_p50': self._percentile(self._processing, 0.5),
+                'processing_p95': self._percentile(self._processing, 0.95),
+                # Time from the last chunk to the final transcript
+                'final_latency_p50': self._percentile(self._final, 0.5),
+                'final_latency_p95': self._percentile(self._final, 0.95),
+            }
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def stats_for(backend):
+    with _stats_lock:
+        return _stats.setdefault(backend, LatencyStats())
+
+
+def metrics():
+    with _stats_lock:
+        backends = dict(_stats)
+    return {name: stats.snapshot() for name, stats in backends.items()}
+
+
+class TranscriptionSession:
+    name = None
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.segments = []
+        self.audio_bytes = 0
+        self.processing_seconds = 0.0
+
+    def accept(self, chunk):
+        started = time.perf_counter()
+        self.audio_bytes += len(chunk)
+        segment = self._accept(chunk)
+        self.processing_seconds += time.perf_counter() - started
+        if segment:
+            self.segments.append(segment)
+        return segment
+
+    def finish(self):
+        started = time.perf_counter()
+        failed = True
+        try:
+            segment = self._finish()
+            if segment:
+                self.segments.append(segment)
+            text = ' '.join(self.segments)
+            if not text:
+                raise sr.UnknownValueError()
+            failed = False
+            return text
+        finally:
+            final_seconds = time.perf_counter() - started
+            self.processing_seconds += final_seconds
+            stats_for(self.name).record(self.audio_seconds, self.processing_seconds, final_seconds, failed)
+
+    @property
+    def audio_seconds(self):
+        return self.audio_bytes / (2 * self.sample_rate)
+
+    def _accept(self, chunk):
+        raise NotImplementedError
+
+    def _finish(self):
+        raise NotImplementedError
+
+
+class GoogleSession(TranscriptionSession):
+    """Google Web Speech API: the audio is sent in one request when it ends."""
+
+    name = 'google'
+
+    def __init__(self, sample_rate):
+        super().__init__(sample_rate)
+        self._chunks = []
+
+    def _accept(self, chunk):
+        self._chunks.append(chunk)
+
+    def _finish(self):
+        audio = sr.AudioData(b''.join(self._chunks), self.sample_rate, 2)
+        self._chunks = []
+        return sr.Recognizer().recognize_google(audio)
+
+
+class VoskSession(TranscriptionSession):
+    """Local Kaldi model on the CPU: works offline, decodes as audio arrives."""
+
+    name = 'vosk'
+
+    def __init__(self, sample_rate):
+        from vosk import KaldiRecognizer
+
+        super().__init__(sample_rate)
+        self._recognizer = KaldiRecognizer(registry.get('vosk'), sample_rate)
+
+    def _accept(self, chunk):
+        # True once the recognizer detects the end of an utterance
+        if self._recognizer.AcceptWaveform(chunk):
+            return json.loads(self._recognizer.Result()).get('text', '')
+
+    def _finish(self):
+        return json.loads(self._recognizer.FinalResult()).get('text', '')
+
+
+BACKENDS = {
+    'google': GoogleSession,
+    'vosk': VoskSession,
+}
+
+
+def configured_backend():
+    backend = getattr(settings, 'RECOMMENDER_SPEECH_BACKEND', 'google')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"Unknown RECOMMENDER_SPEECH_BACKEND '{backend}'; choose one of {', '.join(BACKENDS)}."
+        )
+    return backend
+
+
+def start_session(sample_rate, backend=None):
+    return BACKENDS[backend or configured_backend()](sample_rate)
+
+
+def iter_audio_chunks(source, seconds=None):
+    """Read an open sr.AudioFile incrementally as 16-bit mono PCM chunks."""
+    seconds = seconds or getattr(settings, 'RECOMMENDER_SPEECH_CHUNK_SECONDS', 0.5)
+    frames = max(1, int(source.SAMPLE_RATE * seconds))
+    while True:
+        # AudioFile's stream already downmixes to mono
+        chunk = source.stream.read(frames)
+        if not chunk:
+            return
+        if source.SAMPLE_WIDTH != 2:
+            chunk = audioop.lin2lin(chunk, source.SAMPLE_WIDTH, 2)
+        yield chunk
+
+
+def transcribe(audio_file, backend=None):
+    """Transcribe a WAV, AIFF or FLAC file, streaming it through the backend."""
+    with sr.AudioFile(audio_file) as source:
+        session = start_session(source.SAMPLE_RATE, backend)
+        for chunk in iter_audio_chunks(source):
+            session.accept(chunk)
+    return session.finish()
+
+
+def iter_wav_chunks(reader, seconds=None):
+    """Read an open wave reader incrementally as 16-bit mono PCM chunks."""
+    seconds = seconds or getattr(settings, 'RECOMMENDER_SPEECH_CHUNK_SECONDS', 0.5)
+    width, channels = reader.getsampwidth(), reader.getnchannels()
+    if channels > 2:
+        raise ValueError(f"Unsupported WAV channel count: {channels}")
+    frames = max(1, int(reader.getframerate() * seconds))
+    while True:
+        chunk = reader.readframes(frames)
+        if not chunk:
+            return
+        if width == 1:
+            # 8-bit WAV samples are unsigned
+            chunk = audioop.bias(chunk, 1, -128)
+        if channels == 2:
+            chunk = audioop.tomono(chunk, width, 0.5, 0.5)
+        if width != 2:
+            chunk = audioop.lin2lin(chunk, width, 2)
+        yield chunk
+
+
+def iter_wav_transcript(audio_file, backend=None):
+    """Transcribe a PCM WAV file as it is read.
+
+    `audio_file` only needs read(); nothing is buffered beyond one chunk.
+    Yields ('partial', text) for each utterance the backend finalizes while
+    decoding, then ('final', full_transcript).
+    """
+    with wave.open(audio_file, 'rb') as reader:
+        session = start_session(reader.getframerate(), backend)
+        for chunk in iter_wav_chunks(reader):
+            segment = session.accept(chunk)
+            if segment:
+                yield 'partial', segment
+    yield 'final', session.finish()
+
+
+# Streaming transcription runs on its own bounded pool, and at most
+# RECOMMENDER_SPEECH_MAX_STREAMS recordings are decoded at once per process
+_executor = None
+_executor_lock = threading.Lock()
+stream_slots = threading.BoundedSemaphore(getattr(settings, 'RECOMMENDER_SPEECH_MAX_STREAMS', 4))
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'RECOMMENDER_SPEECH_WORKERS', 2),
+                thread_name_prefix='speech',
+            )
+        return _executor
@@ -1,3 +1,120 @@
-from django.test import TestCase
+import random
+import string
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .fuzzy import SpellingCorrector, read_lexicon
+from .knowledge import DEFAULT_LEXICON, DEFAULT_PATH, KnowledgeBase
+from .matcher import tokenize
+
+
+def osa_distance(a, b):
+    """Unbounded optimal string alignment distance, the slow reference."""
+    table = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1, table[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+class SymptomMatchingTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Only the bundled word list, so results don't depend on the host's dictionary
+        cls.knowledge_base = KnowledgeBase.from_file(DEFAULT_PATH, lexicon=read_lexicon(DEFAULT_LEXICON[:1]))
+
+    def match(self, text):
+        return self.knowledge_base.match_symptoms(text)
+
+    def test_typos_are_corrected(self):
+        self.assertEqual(self.match('I have a bad hedache'), ['headache'])
+        self.assertEqual(self.match('diarhea since yesterday'), ['diarrhea'])
+        self.assertEqual(self.match('sore thorat and a fevr'), ['sore throat'])
+        self.assertEqual(self.match('shortnes of breth when walking'), ['shortness of breath'])
+
+    def test_plurals_of_symptom_words(self):
+        self.assertEqual(self.match('headaches every morning'), ['headache'])
+        self.assertEqual(self.match('my ankle is swollen, swollen ankle'), ['swollen ankles'])
+
+    def test_inflected_symptom_words(self):
+        self.assertEqual(self.match('I am coughing a lot'), ['cough'])
+        self.assertEqual(self.match('I have rashes on my arm'), ['rash'])
+        self.assertEqual(self.match('I am coughing and have a fever'), ['cough', 'fever'])
+        self.assertEqual(self.match('vomited twice and my hands keep shaking'), ['vomiting'])
+        self.assertEqual(self.match('my skin itches'), ['itching'])
+
+    def test_english_words_are_not_symptoms(self):
+        for text in [
+            'had a tough day at work',
+            'I never feel well',
+            'a rough week with fewer hours of sleep',
+            'last night I could not paint',
+            'he tried to cheat at chess',
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(self.match(text), [])
+
+    def test_corrections_outside_a_phrase_are_dropped(self):
+        tokens = tokenize('dificulty with the stairs')
+        self.assertEqual(self.knowledge_base.correct(tokens), tokens)
+        self.assertEqual(self.knowledge_base.correct(tokenize('dificulty breathing')), ['difficulty', 'breathing'])
+
+    def test_rank_conditions(self):
+        ranked = self.knowledge_base.rank_conditions(self.match('nausea, vomiting and diarrhea'))
+        self.assertEqual([(condition['disease'], score) for condition, score in ranked],
+                         [('Gastroenteritis', 2.0), ('Food Poisoning', 1.0)])
+
+    def test_duplicate_disease_rejected(self):
+        condition = {'id': 'flu', 'disease': 'Flu'}
+        with self.assertRaisesMessage(ValueError, "Duplicate condition 'Flu'"):
+            KnowledgeBase({'conditions': [condition, {**condition, 'id': 'flu-2'}], 'symptoms': []}, lexicon=())
+
+    def test_fuzzy_off(self):
+        self.assertEqual(self.knowledge_base.match_symptoms('hedache', fuzzy=False), [])
+
+
+class SpellingCorrectorTests(SimpleTestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        letters = string.ascii_lowercase[:8]
+        vocabulary = {''.join(rng.choice(letters) for _ in range(rng.randint(4, 11))) for _ in range(300)}
+        speller = SpellingCorrector(vocabulary)
+        queries = []
+        for word in rng.sample(sorted(vocabulary), 150):
+            typo = list(word)
+            for _ in range(rng.randint(1, 2)):
+                position = rng.randrange(len(typo))
+                edit = rng.choice('isdt')
+                if edit == 'i':
+                    typo.insert(position, rng.choice(letters))
+                elif edit == 's':
+                    typo[position] = rng.choice(letters)
+                elif edit == 'd' and len(typo) > 1:
+                    del typo[position]
+                elif edit == 't' and position + 1 < len(typo):
+                    typo[position], typo[position + 1] = typo[position + 1], typo[position]
+            queries.append(''.join(typo))
+        queries.extend(''.join(rng.choice(letters) for _ in range(rng.randint(5, 10))) for _ in range(150))
+
+        for query in queries:
+            if query in vocabulary or len(query) < speller.min_length:
+                continue
+            limit = speller.max_distance(query)
+            best = min(osa_distance(query, word) for word in vocabulary)
+            corrected = speller.correct_word(query)
+            with self.subTest(query=query):
+                if best > limit:
+                    self.assertEqual(corrected, query)
+                else:
+                    self.assertIn(corrected, vocabulary)
+                    self.assertEqual(osa_distance(query, corrected), best)
+
+    def test_lexicon_words_are_kept(self):
+        speller = SpellingCorrector(['cough', 'fever', 'pain'], lexicon={'tough', 'fewer', 'pains'})
+        self.assertEqual(speller.correct(['tough', 'fewer', 'cuogh', 'pains']), ['tough', 'fewer', 'cough', 'pains'])
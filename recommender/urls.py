@@ -4,5 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.recommender, name='recommender'),
     path('speech/', views.speech_to_text, name='speech_to_text'),
+    path('speech/stream/', views.stream_speech, name='stream_speech'),
+    path('speech/metrics/', views.speech_metrics, name='speech_metrics'),
     #path('predict/', views.predict_view, name='predict'),
 ]
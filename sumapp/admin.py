@@ -1,3 +1,34 @@
 from django.contrib import admin
+from .models import SummaryJob, SummaryCacheEntry, SummaryCacheStats
 
-# Register your models here.
+
+class SummaryJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'filename', 'user', 'profile', 'status', 'chunks_done', 'chunks_total', 'created_at', 'finished_at')
+    list_filter = ('status', 'profile')
+    exclude = ('pdf_data',)
+    readonly_fields = ('chunks_done', 'chunks_total', 'started_at', 'finished_at')
+
+
+admin.site.register(SummaryJob, SummaryJobAdmin)
+
+
+class SummaryCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('pdf_sha256', 'hits', 'size_bytes', 'created_at', 'last_used_at')
+    readonly_fields = ('key', 'pdf_sha256', 'hits', 'size_bytes', 'created_at', 'last_used_at')
+    search_fields = ('pdf_sha256',)
+
+
+class SummaryCacheStatsAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'hits', 'misses', 'hit_rate_display', 'evictions')
+    readonly_fields = ('hits', 'misses', 'evictions')
+
+    @admin.display(description='Hit rate')
+    def hit_rate_display(self, obj):
+        return f"{obj.hit_rate:.1%}"
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(SummaryCacheEntry, SummaryCacheEntryAdmin)
+admin.site.register(SummaryCacheStats, SummaryCacheStatsAdmin)
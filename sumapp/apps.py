@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+
+
+def _start_job_recovery(**kwargs):
+    from . import jobs
+    jobs.start_recovery()
+    request_started.disconnect(dispatch_uid='sumapp.start_job_recovery')
 
 
 class SumappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sumapp"
+
+    def ready(self):
+        # Serving processes sweep the job queue from their first request on:
+        # management commands never start the thread, and with gunicorn
+        # --preload it starts in each forked worker rather than the master.
+        if getattr(settings, 'SUMMARY_JOB_RUN_IN_PROCESS', True):
+            request_started.connect(_start_job_recovery, dispatch_uid='sumapp.start_job_recovery')
+
+        # Models load lazily on first use; opt in to loading them at boot
+        # (e.g. with gunicorn --preload so forked workers share the pages).
+        if getattr(settings, 'SUMMARIZER_WARMUP', False):
+            from . import registry
+            registry.warm_up()
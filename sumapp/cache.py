@@ -0,0 +1,102 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from . import profiles
+from .models import SummaryCacheEntry, SummaryCacheStats
+
+# Bump when the pipeline changes in a way that makes old summaries stale
+CACHE_VERSION = 2
+
+
+def pdf_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def summary_params(profile=None):
+    """Everything besides the PDF bytes that determines the summary."""
+    return {
+        'version': CACHE_VERSION,
+        'model': getattr(settings, 'SUMMARIZER_MODEL_NAME', 'facebook/bart-large-cnn'),
+        'backend': getattr(settings, 'SUMMARIZER_BACKEND', 'torch'),
+        'generation': profiles.generation_kwargs(profile),
+        'chunk_overlap': getattr(settings, 'SUMMARIZER_CHUNK_OVERLAP', 0),
+        'mode': getattr(settings, 'SUMMARIZER_MODE', 'map_reduce'),
+        'target_tokens': getattr(settings, 'SUMMARIZER_TARGET_TOKENS', 512),
+    }
+
+
+def cache_key(digest, params=None):
+    params = summary_params() if params is None else params
+    payload = json.dumps({'pdf': digest, 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _bump(field, amount=1):
+    updated = SummaryCacheStats.objects.filter(pk=1).update(**{field: F(field) + amount})
+    if not updated:
+        SummaryCacheStats.objects.get_or_create(pk=1)
+        SummaryCacheStats.objects.filter(pk=1).update(**{field: F(field) + amount})
+
+
+def lookup(digest, params=None, count_miss=True):
+    """Return the cached SummaryCacheEntry for these PDF bytes, or None.
+
+    Pass count_miss=False for a re-check of a lookup that already missed.
+    """
+    key = cache_key(digest, params)
+    max_age = getattr(settings, 'SUMMARY_CACHE_MAX_AGE', timedelta(days=30))
+    entry = SummaryCacheEntry.objects.filter(key=key, created_at__gte=timezone.now() - max_age).first()
+    if entry is None:
+        if count_miss:
+            _bump('misses')
+        return None
+    SummaryCacheEntry.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    _bump('hits')
+    return entry
+
+
+def store(digest, summary, key_points, params=None):
+    key = cache_key(digest, params)
+    size = len(summary.encode('utf-8')) + len(json.dumps(key_points).encode('utf-8'))
+    SummaryCacheEntry.objects.update_or_create(
+        key=key,
+        defaults={
+            'pdf_sha256': digest,
+            'summary': summary,
+            'key_points': key_points,
+            'size_bytes': size,
+            'last_used_at': timezone.now(),
+        },
+    )
+    evict()
+
+
+def evict():
+    """Drop expired entries, then least recently used ones over the size limits."""
+    max_age = getattr(settings, 'SUMMARY_CACHE_MAX_AGE', timedelta(days=30))
+    max_entries = getattr(settings, 'SUMMARY_CACHE_MAX_ENTRIES', 1000)
+    max_bytes = getattr(settings, 'SUMMARY_CACHE_MAX_BYTES', 50 * 1024 * 1024)
+
+    evicted, _ = SummaryCacheEntry.objects.filter(created_at__lt=timezone.now() - max_age).delete()
+
+    entries = SummaryCacheEntry.objects.order_by('last_used_at')
+    count = entries.count()
+    total = entries.aggregate(total=Sum('size_bytes'))['total'] or 0
+    stale = []
+    for pk, size in entries.values_list('pk', 'size_bytes').iterator():
+        if count <= max_entries and total <= max_bytes:
+            break
+        stale.append(pk)
+        count -= 1
+        total -= size
+    if stale:
+        evicted += SummaryCacheEntry.objects.filter(pk__in=stale).delete()[0]
+
+    if evicted:
+        _bump('evictions', evicted)
+    return evicted
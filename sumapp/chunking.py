@@ -0,0 +1,58 @@
+import re
+
+# Split after sentence-ending punctuation, keeping the following whitespace
+# on the next sentence so each piece tokenizes exactly as it does in context
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])(?=\s)')
+
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def iter_token_chunks(pages, tokenizer, max_tokens=1024, overlap=0):
+    """Yield model-ready token id lists built from a stream of page texts.
+
+    Every page is split into sentences and tokenized once with the fast
+    tokenizer. Sentences are packed into chunks of at most `max_tokens` ids,
+    special tokens included, and chunks are only cut between sentences. Each
+    new chunk starts with the trailing sentences of the previous one, up to
+    `overlap` tokens. A single sentence longer than a chunk is split on
+    token boundaries.
+    """
+    budget = max_tokens - tokenizer.num_special_tokens_to_add()
+    if overlap >= budget:
+        raise ValueError("Chunk overlap must be smaller than the chunk size.")
+
+    current = []
+    current_len = 0
+
+    def carry_over():
+        kept, kept_len = [], 0
+        for ids in reversed(current):
+            if kept_len + len(ids) > overlap:
+                break
+            kept.insert(0, ids)
+            kept_len += len(ids)
+        return kept, kept_len
+
+    for page_text in pages:
+        sentences = split_sentences(page_text + "\n")
+        if not sentences:
+            continue
+        for ids in tokenizer(sentences, add_special_tokens=False)['input_ids']:
+            while len(ids) > budget:
+                if current:
+                    yield tokenizer.build_inputs_with_special_tokens([i for s in current for i in s])
+                    current, current_len = [], 0
+                yield tokenizer.build_inputs_with_special_tokens(ids[:budget])
+                ids = ids[budget:]
+            if current and current_len + len(ids) > budget:
+                yield tokenizer.build_inputs_with_special_tokens([i for s in current for i in s])
+                current, current_len = carry_over()
+                while current and current_len + len(ids) > budget:
+                    current_len -= len(current.pop(0))
+            current.append(ids)
+            current_len += len(ids)
+
+    if current:
+        yield tokenizer.build_inputs_with_special_tokens([i for s in current for i in s])
@@ -1,4 +1,5 @@
 from django import forms
+from .profiles import default_profile, profile_choices
 
 class UploadFileForm(forms.Form):
     pdf_file = forms.FileField(
@@ -7,10 +8,20 @@ class UploadFileForm(forms.Form):
         allow_empty_file=False,
         widget=forms.FileInput(attrs={'accept': 'application/pdf'})
     )
+    profile = forms.ChoiceField(
+        label='Summary mode',
+        choices=profile_choices,
+        required=False,
+        help_text='Fast returns quickly; quality uses full beam search.',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['profile'].initial = default_profile()
 
     def clean_pdf_file(self):
         pdf_file = self.cleaned_data.get('pdf_file')
         if pdf_file:
             if not pdf_file.name.lower().endswith('.pdf'):
                 raise forms.ValidationError("Only PDF files are allowed.")
-        return pdf_file
\ No newline at end of file
+        return pdf_file
@@ -0,0 +1,157 @@
+import logging
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import fitz
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_workers = 1
+_pool_lock = threading.Lock()
+
+
+@contextmanager
+def open_pdf(source):
+    """Yield the bytes of a PDF without writing or re-reading it.
+
+    `source` may be a Django UploadedFile, a path, or a bytes-like object.
+    Large uploads that Django spooled to a temp file are memory-mapped;
+    in-memory uploads and bytes are used as they are.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield source
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        path = source
+    elif hasattr(source, 'temporary_file_path'):
+        path = source.temporary_file_path()
+    else:
+        source.seek(0)
+        yield source.read()
+        return
+
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("The PDF file is empty.")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def pdf_path(source):
+    """The file behind `source` if it is a path or an upload Django spooled to disk."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if hasattr(source, 'temporary_file_path'):
+        return source.temporary_file_path()
+    return None
+
+
+def _document_source(source):
+    # MuPDF reads files by path itself, so those are never loaded into
+    # Python; in-memory uploads are read, and an mmap or memoryview (which
+    # PyMuPDF does not take) is copied to bytes once
+    path = pdf_path(source)
+    if path is not None:
+        if os.path.getsize(path) == 0:
+            raise ValueError("The PDF file is empty.")
+        return path
+    if hasattr(source, 'read'):
+        source.seek(0)
+        return source.read()
+    return source if isinstance(source, bytes) else bytes(source)
+
+
+@contextmanager
+def _as_file(source):
+    if isinstance(source, str):
+        yield source
+        return
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as file:
+        file.write(source)
+        file.flush()
+        yield file.name
+
+
+def _open_document(source):
+    """`source` is a path or the PDF bytes."""
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_range(source, start, stop):
+    # Runs in a pool process: each worker opens its own copy of the document,
+    # since a MuPDF document cannot be shared between threads
+    results = []
+    with _open_document(source) as document:
+        for page_number in range(start, stop):
+            started = time.perf_counter()
+            text = document.load_page(page_number).get_text()
+            results.append((text, time.perf_counter() - started))
+    return results
+
+
+def _get_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = getattr(settings, 'PDF_EXTRACT_WORKERS', min(4, os.cpu_count() or 1))
+            # spawn, not fork: the web process has model and job threads running
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _iter_timed_pages(source):
+    source = _document_source(source)
+    with _open_document(source) as document:
+        page_count = document.page_count
+        min_pages = getattr(settings, 'PDF_PARALLEL_MIN_PAGES', 64)
+        if page_count < min_pages:
+            for page_number in range(page_count):
+                started = time.perf_counter()
+                text = document.load_page(page_number).get_text()
+                yield text, time.perf_counter() - started
+            return
+
+    # Large document: one page range per worker process, yielded in order.
+    # Workers are sent a path rather than the PDF bytes, so nothing large is
+    # pickled; an in-memory PDF is written to a temporary file once
+    pool = _get_pool()
+    step = -(-page_count // _pool_workers)
+    with _as_file(source) as path:
+        futures = [pool.submit(_extract_range, path, start, min(start + step, page_count))
+                   for start in range(0, page_count, step)]
+        for future in futures:
+            yield from future.result()
+
+
+def iter_pages(source, timings=None):
+    """Yield the text of each page in turn.
+
+    `source` is anything open_pdf accepts (or a buffer it yielded). Paths
+    and spooled uploads are parsed from the file itself, without reading
+    the PDF into memory. If `timings` is a list, the extraction time of each page in seconds is
+    appended to it as the pages are produced.
+    """
+    total = 0.0
+    count = 0
+    for text, seconds in _iter_timed_pages(source):
+        if timings is not None:
+            timings.append(seconds)
+        total += seconds
+        count += 1
+        yield text
+    logger.debug("Extracted %d PDF pages in %.1f ms of page time", count, total * 1000)
+
+
+def extract_text(source, timings=None):
+    return ''.join(iter_pages(source, timings))
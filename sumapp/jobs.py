@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import cache as summary_cache, ingest, pipeline, profiles
+from .models import SummaryJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_recovery_thread = None
+_recovery_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SUMMARY_JOB_WORKERS', 2),
+                thread_name_prefix='summary-job',
+            )
+        return _executor
+
+
+def enqueue(pdf_file, user=None, profile=None, batch_id=None):
+    """Store an uploaded PDF as a queued job and return the job right away.
+
+    Uploads already in the summary cache come back as finished jobs without
+    touching the queue or the models.
+    """
+    owner = user if user is not None and user.is_authenticated else None
+    profile = profiles.resolve(profile)
+
+    with ingest.open_pdf(pdf_file) as buffer:
+        digest = summary_cache.pdf_digest(buffer)
+
+        cached = summary_cache.lookup(digest, summary_cache.summary_params(profile))
+        if cached is not None:
+            now = timezone.now()
+            return SummaryJob.objects.create(
+                user=owner,
+                batch_id=batch_id,
+                filename=pdf_file.name,
+                profile=profile,
+                pdf_sha256=digest,
+                status=SummaryJob.DONE,
+                summary=cached.summary,
+                key_points=cached.key_points,
+                started_at=now,
+                finished_at=now,
+            )
+
+        job = SummaryJob.objects.create(
+            user=owner,
+            batch_id=batch_id,
+            filename=pdf_file.name,
+            profile=profile,
+            pdf_sha256=digest,
+            pdf_data=buffer,
+        )
+    if getattr(settings, 'SUMMARY_JOB_RUN_IN_PROCESS', True):
+        # Commit first so a pool thread never looks for a row it cannot see yet
+        transaction.on_commit(lambda: _get_executor().submit(drain_queue))
+    return job
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running and return its id."""
+    while True:
+        job_id = (
+            SummaryJob.objects.filter(status=SummaryJob.QUEUED)
+            .order_by('created_at')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = SummaryJob.objects.filter(id=job_id, status=SummaryJob.QUEUED).update(
+            status=SummaryJob.RUNNING, started_at=now, heartbeat_at=now
+        )
+        if claimed:
+            return job_id
+
+
+def run_job(job_id):
+    job = SummaryJob.objects.get(id=job_id)
+    chunk_summaries = []
+    chunk_lock = threading.Lock()
+
+    def report_progress(done, total):
+        SummaryJob.objects.filter(id=job_id).update(chunks_done=done, chunks_total=total, heartbeat_at=timezone.now())
+
+    def report_chunk(index, summary):
+        # Map workers finish out of order; the list only ever grows, so a
+        # streaming reader can resume from the number of entries it has seen
+        with chunk_lock:
+            chunk_summaries.append({'index': index, 'summary': summary})
+            SummaryJob.objects.filter(id=job_id).update(chunk_summaries=chunk_summaries)
+
+    try:
+        # The miss was already counted at enqueue; an identical upload may
+        # have finished while this one sat in the queue
+        summary, key_points, _ = pipeline.summarize(
+            job.pdf_data,
+            profile=job.profile,
+            digest=job.pdf_sha256 or None,
+            progress=report_progress,
+            on_chunk=report_chunk,
+            count_miss=False,
+        )
+    except Exception as e:
+        logger.exception("Summary job %s failed", job_id)
+        SummaryJob.objects.filter(id=job_id).update(
+            status=SummaryJob.FAILED, error=str(e), pdf_data=None, finished_at=timezone.now()
+        )
+        return
+    SummaryJob.objects.filter(id=job_id).update(
+        status=SummaryJob.DONE,
+        summary=summary,
+        key_points=key_points,
+        pdf_data=None,
+        finished_at=timezone.now(),
+    )
+
+
+def drain_queue():
+    """Run queued jobs until none are left. Safe to call from several threads."""
+    try:
+        while True:
+            job_id = claim_next_job()
+            if job_id is None:
+                return
+            run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def requeue_stale_jobs(stale_after=None):
+    """Put jobs left running by a crashed worker back in the queue: every
+    running job, or with `stale_after` only those whose worker has given no
+    sign of life for that many seconds."""
+    running = SummaryJob.objects.filter(status=SummaryJob.RUNNING)
+    if stale_after is not None:
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        running = running.filter(Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True))
+    return running.update(
+        status=SummaryJob.QUEUED, started_at=None, heartbeat_at=None, chunks_done=0, chunk_summaries=[]
+    )
+
+
+def recover_jobs():
+    """Requeue stale jobs and hand anything queued to the in-process pool."""
+    try:
+        count = requeue_stale_jobs(getattr(settings, 'SUMMARY_JOB_STALE_SECONDS', 900))
+        if count:
+            logger.warning("Requeued %d stale summary job(s)", count)
+        if SummaryJob.objects.filter(status=SummaryJob.QUEUED).exists():
+            _get_executor().submit(drain_queue)
+    finally:
+        close_old_connections()
+
+
+def _recover_forever():
+    interval = getattr(settings, 'SUMMARY_JOB_RECOVERY_INTERVAL', 60)
+    while True:
+        try:
+            recover_jobs()
+        except Exception:
+            logger.exception("Summary job recovery failed")
+        time.sleep(interval)
+
+
+def start_recovery():
+    """Start this process's recovery thread, once.
+
+    In-process mode has no standalone worker to pick up jobs left behind by
+    a restart, so every web process sweeps the queue at start-up and then
+    every SUMMARY_JOB_RECOVERY_INTERVAL seconds.
+    """
+    global _recovery_thread
+    with _recovery_lock:
+        if _recovery_thread is None:
+            _recovery_thread = threading.Thread(target=_recover_forever, name='summary-job-recovery', daemon=True)
+            _recovery_thread.start()
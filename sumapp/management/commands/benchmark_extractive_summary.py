@@ -0,0 +1,59 @@
+# sumapp/management/commands/benchmark_extractive_summary.py
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from sklearn.cluster import KMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from sumapp.ranking import top_sentence_indices
+
+# Synthetic clinical-sized vocabulary with Zipf-distributed word frequencies
+VOCABULARY = [f"term{i}" for i in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def kmeans_summary_indices(sentences, num_sentences=5):
+    # The ranking summarize_text used before sumapp.ranking
+    vectorizer = TfidfVectorizer(stop_words='english')
+    X = vectorizer.fit_transform(sentences)
+    num_clusters = min(len(sentences), num_sentences)
+    # n_init=10 was the default in the pinned scikit-learn 1.3
+    kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
+    kmeans.fit(X)
+    order_centroids = kmeans.cluster_centers_.argsort()[:, ::-1]
+    summary_sentences = []
+    for i in range(num_clusters):
+        for idx in order_centroids[i]:
+            if idx < len(sentences):
+                summary_sentences.append(sentences[idx])
+                break
+    summary_sentences.sort(key=lambda x: sentences.index(x))
+    return summary_sentences
+
+
+class Command(BaseCommand):
+    help = 'Compare the TextRank extractive ranker against the old per-call KMeans ranking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sentences', type=int, nargs='+', default=[100, 1000, 10000])
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.stdout.write(f"{'sentences':>10} {'KMeans (s)':>11} {'TextRank (s)':>13} {'speedup':>9}")
+        for count in options['sentences']:
+            sentences = [
+                " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=rng.randint(8, 20))) + "."
+                for _ in range(count)
+            ]
+
+            started = time.perf_counter()
+            kmeans_summary_indices(sentences)
+            old = time.perf_counter() - started
+
+            started = time.perf_counter()
+            top_sentence_indices(sentences)
+            new = time.perf_counter() - started
+
+            self.stdout.write(f"{count:>10} {old:>11.3f} {new:>13.3f} {old / new:>8.1f}x")
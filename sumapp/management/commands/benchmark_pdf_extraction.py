@@ -0,0 +1,66 @@
+# sumapp/management/commands/benchmark_pdf_extraction.py
+import io
+import statistics
+import time
+
+import fitz
+import PyPDF2
+from django.core.management.base import BaseCommand
+
+from sumapp.ingest import extract_text
+
+SAMPLE_LINE = (
+    "Patient presented with intermittent chest pain and shortness of breath; "
+    "ECG showed sinus rhythm, troponin within normal limits."
+)
+
+
+def make_pdf(pages, lines_per_page=40):
+    """Build an in-memory PDF with `pages` pages of clinical-looking text."""
+    document = fitz.open()
+    for page_number in range(pages):
+        page = document.new_page()
+        text = "\n".join(f"{page_number}.{line} {SAMPLE_LINE}" for line in range(lines_per_page))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=7)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def extract_with_pypdf2(data):
+    # The extraction path summarize_pdf used before sumapp.ingest
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    return text
+
+
+class Command(BaseCommand):
+    help = 'Compare PDF text extraction speed of sumapp.ingest against the old PyPDF2 path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 50, 500],
+                            help='Page counts of the generated test documents')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+
+    def time_best(self, func, data, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(data)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'pages':>6} {'PyPDF2 (s)':>12} {'ingest (s)':>12} {'speedup':>9} {'median page (ms)':>18}")
+        for pages in options['pages']:
+            data = make_pdf(pages)
+            old = self.time_best(extract_with_pypdf2, data, options['repeat'])
+            new = self.time_best(extract_text, data, options['repeat'])
+
+            timings = []
+            extract_text(data, timings)
+            median_page = statistics.median(timings) * 1000 if timings else 0.0
+
+            self.stdout.write(f"{pages:>6} {old:>12.3f} {new:>12.3f} {old / new:>8.1f}x {median_page:>18.2f}")
@@ -0,0 +1,81 @@
+# sumapp/management/commands/compare_summarizer_backends.py
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sumapp import chunking, ingest, registry
+from sumapp.backends import BACKENDS
+from website.summarizer import summarize_token_chunks
+
+
+def rouge_l(candidate, reference):
+    """ROUGE-L F1 between two texts, on lower-cased whitespace tokens."""
+    a, b = candidate.lower().split(), reference.lower().split()
+    if not a or not b:
+        return 0.0
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b, 1):
+            current.append(previous[j - 1] + 1 if token == other else max(previous[j], current[j - 1]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(a), lcs / len(b)
+    return 2 * precision * recall / (precision + recall)
+
+
+class Command(BaseCommand):
+    help = 'Compare latency and summary quality of the summarizer backends on a directory of PDFs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', help='Directory of PDF files (processed in name order)')
+        parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+        parser.add_argument('--reference', default='torch', choices=list(BACKENDS),
+                            help='Backend whose output is the quality reference')
+        parser.add_argument('--profile', default=None, help='Generation profile (default: SUMMARIZER_DEFAULT_PROFILE)')
+
+    def handle(self, *args, **options):
+        corpus = options['corpus']
+        if not os.path.isdir(corpus):
+            raise CommandError(f"{corpus} is not a directory")
+        paths = sorted(os.path.join(corpus, name) for name in os.listdir(corpus) if name.lower().endswith('.pdf'))
+        if not paths:
+            raise CommandError(f"No PDF files in {corpus}")
+
+        backends = list(dict.fromkeys([options['reference']] + options['backends']))
+
+        # Chunk every document once; all backends share the same tokenizer
+        tokenizer, _ = registry.get(f"bart:{options['reference']}")
+        documents = []
+        for path in paths:
+            documents.append(list(chunking.iter_token_chunks(ingest.iter_pages(path), tokenizer)))
+
+        outputs, latencies = {}, {}
+        for backend in backends:
+            self.stdout.write(f"Loading backend '{backend}'...")
+            registry.get(f'bart:{backend}')
+            outputs[backend], latencies[backend] = [], []
+            for chunks in documents:
+                started = time.perf_counter()
+                summaries = summarize_token_chunks(chunks, backend=backend, profile=options['profile'])
+                latencies[backend].append(time.perf_counter() - started)
+                outputs[backend].append(" ".join(summaries))
+            registry.unload(f'bart:{backend}')
+
+        baseline = statistics.mean(latencies[options['reference']])
+        self.stdout.write(f"\n{len(paths)} documents, {sum(len(d) for d in documents)} chunks\n")
+        self.stdout.write(f"{'backend':<12} {'mean s/doc':>11} {'p95 s/doc':>10} {'speedup':>8} {'ROUGE-L':>8}")
+        for backend in backends:
+            times = sorted(latencies[backend])
+            p95 = times[min(len(times) - 1, int(0.95 * len(times)))]
+            quality = statistics.mean(
+                rouge_l(candidate, reference)
+                for candidate, reference in zip(outputs[backend], outputs[options['reference']])
+            )
+            mean = statistics.mean(times)
+            self.stdout.write(f"{backend:<12} {mean:>11.2f} {p95:>10.2f} {baseline / mean:>7.2f}x {quality:>8.3f}")
@@ -0,0 +1,49 @@
+# sumapp/management/commands/export_onnx_summarizer.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sumapp.backends import model_name, onnx_dir
+
+ONNX_FILES = ('encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx')
+
+
+class Command(BaseCommand):
+    help = 'Export the summarization model to ONNX for the "onnx" SUMMARIZER_BACKEND'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help='Target directory (default: SUMMARIZER_ONNX_DIR)')
+        parser.add_argument('--quantize', action='store_true',
+                            help='Also apply dynamic int8 quantization to the exported graphs')
+
+    def handle(self, *args, **options):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError:
+            raise CommandError("optimum[onnxruntime] is required to export the model.")
+        from transformers import BartTokenizerFast
+
+        output = options['output'] or onnx_dir()
+        os.makedirs(output, exist_ok=True)
+
+        self.stdout.write(f"Exporting {model_name()} to {output}...")
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name(), export=True)
+        model.save_pretrained(output)
+        BartTokenizerFast.from_pretrained(model_name()).save_pretrained(output)
+
+        if options['quantize']:
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+            config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            for file_name in ONNX_FILES:
+                if not os.path.exists(os.path.join(output, file_name)):
+                    continue
+                self.stdout.write(f"Quantizing {file_name}...")
+                quantizer = ORTQuantizer.from_pretrained(output, file_name=file_name)
+                quantizer.quantize(save_dir=output, quantization_config=config)
+                # Replace the fp32 graph so the backend picks up the int8 one
+                quantized = os.path.join(output, file_name.replace('.onnx', '_quantized.onnx'))
+                os.replace(quantized, os.path.join(output, file_name))
+
+        self.stdout.write(self.style.SUCCESS(f"ONNX model written to {output}"))
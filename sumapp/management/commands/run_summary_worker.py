@@ -0,0 +1,32 @@
+# sumapp/management/commands/run_summary_worker.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from sumapp import jobs, registry
+
+
+class Command(BaseCommand):
+    help = 'Run a standalone worker pool that processes queued summary jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--requeue-stale', action='store_true',
+                            help='Requeue jobs left running by a crashed worker before starting')
+
+    def handle(self, *args, **options):
+        if options['requeue_stale']:
+            count = jobs.requeue_stale_jobs()
+            self.stdout.write(f'Requeued {count} stale job(s)')
+
+        registry.warm_up()
+        self.stdout.write(self.style.SUCCESS(f"Summary worker started with {options['workers']} thread(s)"))
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                futures = [pool.submit(jobs.drain_queue) for _ in range(options['workers'])]
+                for future in futures:
+                    future.result()
+                time.sleep(options['poll_interval'])
@@ -0,0 +1,117 @@
+# sumapp/management/commands/summarize_batch.py
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _init_worker(threads):
+    # Spawned workers start from a fresh interpreter: set Django up and load
+    # the models once per process, not once per document
+    import django
+    django.setup()
+
+    import torch
+    from sumapp import registry
+
+    torch.set_num_threads(threads)
+    registry.warm_up()
+
+
+def _summarize_path(path, profile):
+    from django.db import close_old_connections
+    from sumapp import pipeline
+
+    started = time.perf_counter()
+    try:
+        summary, key_points, cached = pipeline.summarize(path, profile=profile)
+        record = {'path': path, 'status': 'done', 'summary': summary, 'key_points': key_points, 'cached': cached}
+    except Exception as e:
+        record = {'path': path, 'status': 'failed', 'error': str(e)}
+    finally:
+        close_old_connections()
+    record['seconds'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+class Command(BaseCommand):
+    help = 'Summarize a directory or list of PDFs into a resumable JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='PDF files to summarize')
+        parser.add_argument('--dir', action='append', default=[], help='Directory to scan recursively for PDFs')
+        parser.add_argument('--output', required=True, help='JSONL file; results are appended as they finish')
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--profile', default=None, help='Generation profile (default: SUMMARIZER_DEFAULT_PROFILE)')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Also rerun documents recorded as failed in the output file')
+
+    def collect_paths(self, options):
+        paths = [os.path.abspath(path) for path in options['paths']]
+        for directory in options['dir']:
+            if not os.path.isdir(directory):
+                raise CommandError(f"{directory} is not a directory")
+            for root, _, files in os.walk(directory):
+                paths.extend(os.path.join(os.path.abspath(root), name)
+                             for name in files if name.lower().endswith('.pdf'))
+        return sorted(set(paths))
+
+    def finished_paths(self, output, retry_failed):
+        # Every completed document is one line in the output, so a crashed run
+        # resumes by skipping them. A torn last line is simply ignored.
+        finished = set()
+        if not os.path.exists(output):
+            return finished
+        with open(output, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('status') == 'done' or not retry_failed:
+                    finished.add(record['path'])
+        return finished
+
+    def handle(self, *args, **options):
+        paths = self.collect_paths(options)
+        if not paths:
+            raise CommandError("No PDF files given; pass paths or --dir")
+
+        finished = self.finished_paths(options['output'], options['retry_failed'])
+        pending = [path for path in paths if path not in finished]
+        self.stdout.write(f"{len(paths)} PDFs, {len(paths) - len(pending)} already done, {len(pending)} to go")
+        if not pending:
+            return
+
+        workers = max(1, options['workers'])
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        started = time.perf_counter()
+        counts = {'done': 0, 'failed': 0, 'cached': 0}
+
+        with open(options['output'], 'a', encoding='utf-8') as output, ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(threads,),
+        ) as pool:
+            futures = [pool.submit(_summarize_path, path, options['profile']) for path in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+
+                counts[record['status']] += 1
+                counts['cached'] += bool(record.get('cached'))
+                if record['status'] == 'failed':
+                    self.stderr.write(f"Failed: {record['path']}: {record['error']}")
+
+        elapsed = time.perf_counter() - started
+        processed = counts['done'] + counts['failed']
+        self.stdout.write(self.style.SUCCESS(
+            f"Summarized {counts['done']} PDFs ({counts['cached']} from cache, {counts['failed']} failed) "
+            f"in {elapsed:.1f}s: {processed / elapsed * 60:.1f} docs/min"
+        ))
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sumapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="summaryjob",
+            name="pdf_sha256",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name="SummaryCacheEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("pdf_sha256", models.CharField(db_index=True, max_length=64)),
+                ("summary", models.TextField()),
+                ("key_points", models.JSONField(blank=True, default=dict)),
+                ("size_bytes", models.PositiveIntegerField(default=0)),
+                ("hits", models.PositiveIntegerField(default=0)),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+                (
+                    "last_used_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+            options={
+                "ordering": ["-last_used_at"],
+                "verbose_name_plural": "summary cache entries",
+            },
+        ),
+        migrations.CreateModel(
+            name="SummaryCacheStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hits", models.PositiveBigIntegerField(default=0)),
+                ("misses", models.PositiveBigIntegerField(default=0)),
+                ("evictions", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "summary cache stats",
+            },
+        ),
+    ]
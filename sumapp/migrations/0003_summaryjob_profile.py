@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sumapp", "0002_summarycache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="summaryjob",
+            name="profile",
+            field=models.CharField(
+                blank=True,
+                help_text="Generation profile from SUMMARIZER_PROFILES",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sumapp", "0003_summaryjob_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="summaryjob",
+            name="batch_id",
+            field=models.UUIDField(
+                blank=True,
+                db_index=True,
+                help_text="Set for jobs submitted together through the batch API",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sumapp", "0004_summaryjob_batch_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="summaryjob",
+            name="chunk_summaries",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Chunk summaries as they finish, for streaming clients",
+            ),
+        ),
+    ]
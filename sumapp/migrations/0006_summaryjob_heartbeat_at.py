@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sumapp", "0005_summaryjob_chunk_summaries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="summaryjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last sign of life from the worker running the job",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,3 +1,100 @@
+import uuid
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+
+class SummaryJob(models.Model):
+    """
+    A queued PDF summarization. The table doubles as the job queue, so the
+    worker pool needs no outside broker.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    batch_id = models.UUIDField(null=True, blank=True, db_index=True, help_text="Set for jobs submitted together through the batch API")
+    filename = models.CharField(max_length=255)
+    profile = models.CharField(max_length=20, blank=True, help_text="Generation profile from SUMMARIZER_PROFILES")
+    pdf_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    pdf_data = models.BinaryField(null=True, help_text="Uploaded PDF, cleared once the job finishes")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    chunks_total = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0)
+    chunk_summaries = models.JSONField(default=list, blank=True, help_text="Chunk summaries as they finish, for streaming clients")
+    summary = models.TextField(blank=True)
+    key_points = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last sign of life from the worker running the job")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Summary job {self.id}: {self.filename} ({self.status})"
+
+    def as_dict(self):
+        return {
+            'id': str(self.id),
+            'filename': self.filename,
+            'status': self.status,
+            'profile': self.profile,
+            'chunks_done': self.chunks_done,
+            'chunks_total': self.chunks_total,
+            'summary': self.summary,
+            'key_points': self.key_points,
+            'error': self.error,
+        }
+
+
+class SummaryCacheEntry(models.Model):
+    """
+    A finished summary, keyed on the SHA-256 of the uploaded PDF bytes and the
+    model/generation parameters that produced it.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    pdf_sha256 = models.CharField(max_length=64, db_index=True)
+    summary = models.TextField()
+    key_points = models.JSONField(default=dict, blank=True)
+    size_bytes = models.PositiveIntegerField(default=0)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-last_used_at']
+        verbose_name_plural = 'summary cache entries'
+
+    def __str__(self):
+        return f"Cached summary {self.pdf_sha256[:12]} ({self.hits} hits)"
+
+
+class SummaryCacheStats(models.Model):
+    """
+    Running hit/miss counters for the summary cache (a single row).
+    """
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+    evictions = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'summary cache stats'
+
+    def __str__(self):
+        return f"Summary cache: {self.hits} hits, {self.misses} misses"
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,28 @@
+from . import cache as summary_cache, ingest, profiles
+
+
+def summarize(pdf_file, profile=None, digest=None, progress=None, count_miss=True, on_chunk=None):
+    """Run PDF -> summary -> key points, going through the summary cache.
+
+    `pdf_file` is anything ingest.open_pdf accepts; `progress(done, total)`
+    and `on_chunk(index, summary)` report on the map stage. Returns a
+    (summary, key_points, cached) tuple.
+    """
+    # Imported here so callers that only hit the cache never load the models
+    from website.summarizer import summarize_pdf
+    from .utils import extract_key_points
+
+    profile = profiles.resolve(profile)
+    if digest is None:
+        with ingest.open_pdf(pdf_file) as buffer:
+            digest = summary_cache.pdf_digest(buffer)
+    params = summary_cache.summary_params(profile)
+
+    cached = summary_cache.lookup(digest, params, count_miss=count_miss)
+    if cached is not None:
+        return cached.summary, cached.key_points, True
+
+    summary = summarize_pdf(pdf_file, progress=progress, profile=profile, on_chunk=on_chunk)
+    key_points = extract_key_points(summary)
+    summary_cache.store(digest, summary, key_points, params)
+    return summary, key_points, False
@@ -0,0 +1,29 @@
+from django.conf import settings
+
+# Named model.generate settings live in SUMMARIZER_PROFILES (frontend/settings.py)
+# and nowhere else; this module only looks them up.
+
+
+def get_profiles():
+    return settings.SUMMARIZER_PROFILES
+
+
+def default_profile():
+    return settings.SUMMARIZER_DEFAULT_PROFILE
+
+
+def resolve(profile=None):
+    """Return the profile name to use, falling back to the default."""
+    profile = profile or default_profile()
+    if profile not in get_profiles():
+        raise ValueError(f"Unknown summary profile '{profile}'")
+    return profile
+
+
+def generation_kwargs(profile=None):
+    """model.generate keyword arguments for a named profile."""
+    return dict(get_profiles()[resolve(profile)])
+
+
+def profile_choices():
+    return [(name, name.capitalize()) for name in get_profiles()]
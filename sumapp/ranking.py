@@ -0,0 +1,48 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def textrank_scores(sentences, damping=0.85, max_iter=100, tol=1e-6):
+    """TextRank score of every sentence over a TF-IDF cosine similarity graph.
+
+    TF-IDF rows are L2-normalized, so the similarity matrix is S = X @ X.T
+    with the self-similarity diagonal removed. S is never built: each power
+    iteration computes S @ v as X @ (X.T @ v) - diag * v, which costs
+    O(nnz(X)) instead of O(n^2) for n sentences.
+    """
+    n = len(sentences)
+    X = TfidfVectorizer(stop_words='english').fit_transform(sentences).tocsr()
+    diag = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+
+    def similarity_dot(v):
+        return X @ (X.T @ v) - diag * v
+
+    degree = similarity_dot(np.ones(n))
+    # Sentences with no similar neighbour spread their score uniformly
+    dangling = degree <= 0
+    degree[dangling] = 1.0
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = scores / degree
+        new_scores = (1 - damping) / n + damping * (
+            similarity_dot(np.where(dangling, 0.0, spread)) + scores[dangling].sum() / n
+        )
+        if np.abs(new_scores - scores).sum() < tol:
+            scores = new_scores
+            break
+        scores = new_scores
+    return scores
+
+
+def top_sentence_indices(sentences, num_sentences=5):
+    """Indices of the `num_sentences` highest-ranked sentences, in text order."""
+    if len(sentences) <= num_sentences:
+        return list(range(len(sentences)))
+    try:
+        scores = textrank_scores(sentences)
+    except ValueError:
+        # Nothing but stop words: keep the opening sentences
+        return list(range(num_sentences))
+    top = np.argpartition(-scores, num_sentences - 1)[:num_sentences]
+    return sorted(top.tolist())
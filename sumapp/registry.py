@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from . import backends
+
+logger = logging.getLogger(__name__)
+
+# Process-wide registry of heavy models. Each entry is loaded once, on first
+# use or through warm_up(), and shared by every caller in the worker.
+_loaders = {}
+_instances = {}
+_lock = threading.RLock()
+
+
+def register(name, loader):
+    """Register a zero-argument callable that builds the model called `name`."""
+    _loaders[name] = loader
+
+
+def get(name):
+    """Return the loaded model for `name`, loading it on first access."""
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _instances:
+            if name not in _loaders:
+                raise KeyError(f"No model registered under '{name}'")
+            logger.info("Loading model '%s'", name)
+            _instances[name] = _loaders[name]()
+        return _instances[name]
+
+
+def is_loaded(name):
+    return name in _instances
+
+
+def unload(name):
+    with _lock:
+        _instances.pop(name, None)
+
+
+def warm_up(names=None):
+    """Eagerly load the given models (default: the summarizer and NER pipeline).
+
+    Call this from a gunicorn `post_worker_init` hook, or set
+    SUMMARIZER_WARMUP = True to have it run when the app registry is ready.
+    """
+    for name in names or ['bart', 'spacy_ner']:
+        get(name)
+
+
+def _load_spacy_ner():
+    import spacy
+    from django.conf import settings
+
+    # Key points only read doc.ents, so load just the NER component (and the
+    # shared tok2vec, only if NER listens to it)
+    nlp = spacy.load(
+        getattr(settings, 'SPACY_MODEL_NAME', 'en_core_web_sm'),
+        exclude=['tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter'],
+    )
+    if 'tok2vec' in nlp.pipe_names and 'ner' not in nlp.get_pipe('tok2vec').listening_components:
+        nlp.remove_pipe('tok2vec')
+    return nlp
+
+
+register('spacy_ner', _load_spacy_ner)
+
+# One entry per inference backend ('bart:torch', 'bart:torch-int8',
+# 'bart:onnx'), plus 'bart' for whichever SUMMARIZER_BACKEND selects.
+for _backend, _loader in backends.BACKENDS.items():
+    register(f'bart:{_backend}', _loader)
+register('bart', lambda: get(f'bart:{backends.configured_backend()}'))
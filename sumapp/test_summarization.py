@@ -1,12 +1,18 @@
-from transformers import BartTokenizer, BartForConditionalGeneration
+from sumapp import profiles, registry
 
 class TextSummarizer:
     def __init__(self):
-        self.tokenizer = BartTokenizer.from_pretrained('facebook/bart-large-cnn')
-        self.model = BartForConditionalGeneration.from_pretrained('facebook/bart-large-cnn')
+        # Share the process-wide BART weights instead of loading a private copy
+        self.tokenizer, self.model = registry.get('bart')
 
-    def summarize(self, text, max_length=150, min_length=50):
-        inputs = self.tokenizer.encode("summarize: " + text, return_tensors="pt", max_length=1024, truncation=True)
-        summary_ids = self.model.generate(inputs, max_length=max_length, min_length=min_length, length_penalty=2.0, num_beams=4, early_stopping=True)
+    def summarize(self, text, max_length=None, min_length=None, profile=None):
+        # Generation settings come from the named profile; explicit lengths override it
+        generation_kwargs = profiles.generation_kwargs(profile)
+        if max_length is not None:
+            generation_kwargs['max_length'] = max_length
+        if min_length is not None:
+            generation_kwargs['min_length'] = min_length
+        inputs = self.tokenizer.encode(text, return_tensors="pt", max_length=1024, truncation=True)
+        summary_ids = self.model.generate(inputs, **generation_kwargs)
         summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
         return summary
@@ -3,4 +3,8 @@ from . import views
 
 urlpatterns = [
     path('upload/', views.upload_and_summarize, name='upload_and_summarize'),
+    path('jobs/<uuid:job_id>/', views.job_status, name='summary_job_status'),
+    path('jobs/<uuid:job_id>/stream/', views.job_stream, name='summary_job_stream'),
+    path('batch/', views.batch_submit, name='summary_batch_submit'),
+    path('batch/<uuid:batch_id>/', views.batch_status, name='summary_batch_status'),
 ]
@@ -1,26 +1,13 @@
-import fitz  
 import re
-import spacy
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-from transformers import BartTokenizer, BartForConditionalGeneration
-
-# Load spaCy model for named entity recognition
-nlp = spacy.load("en_core_web_sm")
-
-# Load BART model and tokenizer
-tokenizer = BartTokenizer.from_pretrained('facebook/bart-large-cnn')
-model = BartForConditionalGeneration.from_pretrained('facebook/bart-large-cnn')
+from django.conf import settings
+from . import registry
+from .chunking import split_sentences
+from .ingest import extract_text
+from .ranking import top_sentence_indices
 
 def extract_text_from_pdf(pdf_file):
     try:
-        text = ''
-        pdf_document = fitz.open(stream=pdf_file.read(), filetype="pdf")
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)
-            text += page.get_text()
-        pdf_document.close()
+        text = extract_text(pdf_file)
         if not text.strip():
             raise ValueError("No text extracted from PDF.")
         return text
@@ -33,45 +20,27 @@ def preprocess_text(text):
     return processed_text
 
 def extract_named_entities(text):
-    doc = nlp(text)
+    nlp = registry.get('spacy_ner')
+    # Feed sentences through nlp.pipe in batches, in this process: the input
+    # is a summary, far too short to pay for worker processes
     entities = {}
-    for ent in doc.ents:
-        if ent.label_ not in entities:
-            entities[ent.label_] = []
-        entities[ent.label_].append(ent.text)
+    docs = nlp.pipe(
+        split_sentences(text),
+        batch_size=getattr(settings, 'SPACY_NER_BATCH_SIZE', 64),
+    )
+    for doc in docs:
+        for ent in doc.ents:
+            if ent.label_ not in entities:
+                entities[ent.label_] = []
+            entities[ent.label_].append(ent.text)
     return entities
 
 def summarize_text(text, num_sentences=5):
     # Split the text into sentences
     sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', text)
-    
-    # If there are fewer sentences than requested, return all sentences
-    if len(sentences) <= num_sentences:
-        return " ".join(sentences)
-    
-    # Create TF-IDF vectorizer
-    vectorizer = TfidfVectorizer(stop_words='english')
-    X = vectorizer.fit_transform(sentences)
-    
-    # Perform K-means clustering
-    num_clusters = min(len(sentences), num_sentences)
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-    kmeans.fit(X)
-    
-    # Get the sentences closest to the cluster centers
-    order_centroids = kmeans.cluster_centers_.argsort()[:, ::-1]
-    
-    summary_sentences = []
-    for i in range(num_clusters):
-        for idx in order_centroids[i]:
-            if idx < len(sentences):
-                summary_sentences.append(sentences[idx])
-                break
-    
-    # Sort the summary sentences based on their original order in the text
-    summary_sentences.sort(key=lambda x: sentences.index(x))
-    
-    return " ".join(summary_sentences)
+
+    # Rank sentences with TextRank and keep the best ones in their original order
+    return " ".join(sentences[i] for i in top_sentence_indices(sentences, num_sentences))
 
 def extract_key_points(text):
     # Extract named entities
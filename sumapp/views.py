@@ -1,45 +1,194 @@
-from django.shortcuts import render
-from django.http import HttpResponse
+import asyncio
+import json
+import uuid
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.shortcuts import render, get_object_or_404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from .forms import UploadFileForm
-from .utils import extract_text_from_pdf, preprocess_text, extract_key_points, summarize_text
-from django.views.decorators.http import require_http_methods
-from django.core.files.storage import FileSystemStorage
-from website.summarizer import summarize_pdf
+from .models import SummaryJob
+from . import jobs, profiles
+from django.views.decorators.http import require_http_methods, require_GET, require_POST
 from django.http import JsonResponse
-import time
+from django.urls import reverse
+from website.decorators import api_login_required
+
 
 @require_http_methods(["GET", "POST"])
 def upload_and_summarize(request):
     if request.method == 'POST':
+        wants_json = 'application/json' in request.headers.get('Accept', '')
         form = UploadFileForm(request.POST, request.FILES)
         if form.is_valid():
             try:
-                pdf_file = request.FILES['pdf_file']
-                fs = FileSystemStorage()
-                filename = fs.save(pdf_file.name, pdf_file)
-                file_path = fs.path(filename)
-                
-                # Simulate loading time for a better UX (e.g., 2 seconds)
-                time.sleep(2) 
-
-                # Extract text from PDF
-                text = extract_text_from_pdf(pdf_file)
-                processed_text = preprocess_text(text)
-
-                # Generate summary and key points
-                summary = summarize_pdf(file_path)
-                key_points = extract_key_points(summary)
-                
-                fs.delete(filename)
-                
-                context = {
-                    'form': form,
-                    'summary': summary,
-                    'key_points': key_points,
-                }
-                return render(request, 'upload.html', context)
+                job = jobs.enqueue(request.FILES['pdf_file'], request.user, form.cleaned_data['profile'])
             except Exception as e:
-                return render(request, 'upload.html', {'form': form, 'error': str(e)})
+                if wants_json:
+                    return JsonResponse({'error': str(e)}, status=400)
+                return render(request, 'User/upload.html', {'form': form, 'error': str(e)})
+
+            if wants_json:
+                return JsonResponse(job_payload(job), status=202)
+            return render(request, 'User/upload.html', {'form': form, 'job_id': job.id})
+        if wants_json:
+            return JsonResponse({'errors': form.errors}, status=400)
     else:
         form = UploadFileForm()
     return render(request, 'User/upload.html', {'form': form})
+
+
+def job_payload(job):
+    payload = job.as_dict()
+    payload['status_url'] = reverse('summary_job_status', args=[job.id])
+    payload['stream_url'] = reverse('summary_job_stream', args=[job.id])
+    return payload
+
+
+@require_GET
+def job_status(request, job_id):
+    job = get_object_or_404(SummaryJob.objects.defer('pdf_data'), id=job_id)
+    if job.user_id is not None and job.user_id != request.user.id:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job_payload(job))
+
+
+def _sse(event, data, event_id=None):
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _job_snapshot(job_id):
+    fields = ('status', 'chunks_total', 'chunks_done', 'chunk_summaries', 'summary', 'key_points', 'error')
+    return SummaryJob.objects.filter(id=job_id).values(*fields).first()
+
+
+def _snapshot_events(job, sent, started):
+    """The events for what changed in `job` since `sent` chunk summaries were
+    streamed, and whether the job has finished."""
+    if job is None:
+        return [_sse('error', {'error': 'Job not found'})], True
+    events = []
+    if job['chunks_total'] and not started:
+        events.append(_sse('start', {'chunks_total': job['chunks_total']}))
+    # The id lets a reconnecting EventSource resume after the chunks it has
+    for position, entry in enumerate(job['chunk_summaries'][sent:], start=sent + 1):
+        events.append(_sse('chunk', {**entry, 'chunks_done': job['chunks_done'],
+                                     'chunks_total': job['chunks_total']}, position))
+
+    if job['status'] == SummaryJob.DONE:
+        events.append(_sse('summary', {'summary': job['summary']}))
+        events.append(_sse('key_points', job['key_points']))
+        events.append(_sse('done', {}))
+        return events, True
+    if job['status'] == SummaryJob.FAILED:
+        events.append(_sse('error', {'error': job['error']}))
+        return events, True
+    return events, False
+
+
+async def _job_events(job_id, sent):
+    # Tails the job row written by the worker pool; the request never runs
+    # the models itself, and waiting between reads holds no thread
+    poll = getattr(settings, 'SUMMARY_JOB_STREAM_POLL_SECONDS', 0.5)
+    started = False
+    while True:
+        job = await sync_to_async(_job_snapshot)(job_id)
+        events, finished = _snapshot_events(job, sent, started)
+        for event in events:
+            yield event
+        if finished:
+            return
+        started = bool(job['chunks_total'])
+        sent = len(job['chunk_summaries'])
+        # A comment line keeps proxies from timing the stream out while queued
+        yield ": waiting\n\n"
+        await asyncio.sleep(poll)
+
+
+def _streamable_job(request, job_id):
+    job = get_object_or_404(SummaryJob.objects.only('user'), id=job_id)
+    if job.user_id is not None and job.user_id != request.user.id:
+        raise Http404('Job not found')
+    return job
+
+
+async def job_stream(request, job_id):
+    """Follow a summary job as Server-Sent Events: each chunk summary as the
+    worker pool finishes it, then the summary and key points.
+
+    Under ASGI the connection stays open and the row is re-read every
+    SUMMARY_JOB_STREAM_POLL_SECONDS. A WSGI worker would be held for the whole
+    job, so there each request answers with what is new since the
+    Last-Event-ID and closes; EventSource reconnects after the retry delay.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET the job stream'}, status=405)
+    try:
+        job = await sync_to_async(_streamable_job)(request, job_id)
+    except Http404:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    try:
+        sent = max(int(request.headers.get('Last-Event-ID', 0)), 0)
+    except ValueError:
+        sent = 0
+
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(_job_events(job.id, sent), content_type='text/event-stream')
+    else:
+        events, finished = _snapshot_events(await sync_to_async(_job_snapshot)(job.id), sent, sent > 0)
+        if not finished:
+            poll = getattr(settings, 'SUMMARY_JOB_STREAM_POLL_SECONDS', 0.5)
+            events.append(f"retry: {int(max(poll, 1) * 1000)}\n\n")
+        response = HttpResponse(''.join(events), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_POST
+@api_login_required
+def batch_submit(request):
+    """Queue a summary job for every PDF in the `pdf_files` uploads."""
+    pdf_files = request.FILES.getlist('pdf_files')
+    if not pdf_files:
+        return JsonResponse({'error': 'No files uploaded in pdf_files'}, status=400)
+    rejected = [f.name for f in pdf_files if not f.name.lower().endswith('.pdf')]
+    if rejected:
+        return JsonResponse({'error': 'Only PDF files are allowed', 'files': rejected}, status=400)
+    try:
+        profile = profiles.resolve(request.POST.get('profile'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    batch_id = uuid.uuid4()
+    batch_jobs = [jobs.enqueue(pdf_file, request.user, profile, batch_id) for pdf_file in pdf_files]
+    return JsonResponse({
+        'batch_id': str(batch_id),
+        'status_url': reverse('summary_batch_status', args=[batch_id]),
+        'jobs': [job_payload(job) for job in batch_jobs],
+    }, status=202)
+
+
+@require_GET
+@api_login_required
+def batch_status(request, batch_id):
+    """Report every job of a batch; ?format=jsonl streams finished results one per line."""
+    batch_jobs = SummaryJob.objects.defer('pdf_data').filter(batch_id=batch_id, user=request.user)
+    if not batch_jobs.exists():
+        return JsonResponse({'error': 'Batch not found'}, status=404)
+
+    if request.GET.get('format') == 'jsonl':
+        finished = batch_jobs.filter(status__in=[SummaryJob.DONE, SummaryJob.FAILED])
+        return StreamingHttpResponse(
+            (json.dumps(job.as_dict()) + "\n" for job in finished.iterator()),
+            content_type='application/x-ndjson',
+        )
+
+    counts = {status: 0 for status, _ in SummaryJob.STATUS_CHOICES}
+    payload = []
+    for job in batch_jobs:
+        counts[job.status] += 1
+        payload.append(job_payload(job))
+    return JsonResponse({'batch_id': str(batch_id), 'counts': counts, 'jobs': payload})
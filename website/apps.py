@@ -7,6 +7,7 @@ class WebsiteConfig(AppConfig):
 
     def ready(self):
         import website.signals
+        import website.prediction_cache  # invalidates cached predictions on artifact loads
 
 
 
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import Signal
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Trained classifiers are stored as versioned joblib artifacts:
+#   <MODEL_ARTIFACTS_DIR>/<name>-v<version>.joblib  scaler, estimator, feature schema
+#   <MODEL_ARTIFACTS_DIR>/<name>.json               manifest of the current version
+# `manage.py train_models` writes them; workers only load them.
+
+ARTIFACT_FORMAT = 2
+
+# Training function for each artifact: train(data_dir) returns a dict with
+# 'estimator', 'scaler' (or None), 'features' and 'metrics', and optionally
+# 'calibration' (Platt sigmoid parameters) and 'baseline' (mean model input)
+TRAINERS = {
+    'diabetes': 'diabetes.model.train',
+    'heart': 'heart.model.train',
+}
+
+# Sent with `artifact` whenever a model artifact is (re)loaded in this process
+artifact_loaded = Signal()
+
+
+def artifacts_dir():
+    return getattr(settings, 'MODEL_ARTIFACTS_DIR', os.path.join(settings.BASE_DIR, 'media', 'models', 'artifacts'))
+
+
+def manifest_path(name):
+    return os.path.join(artifacts_dir(), f'{name}.json')
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelArtifact:
+    """A fitted scaler + estimator pair and the feature order they expect."""
+
+    def __init__(self, name, version, estimator, scaler, features, metrics=None, sha256=None, created_at=None,
+                 calibration=None, baseline=None):
+        self.name = name
+        self.version = version
+        self.estimator = estimator
+        self.scaler = scaler
+        self.features = list(features)
+        self.metrics = metrics or {}
+        self.sha256 = sha256
+        self.created_at = created_at
+        self.calibration = calibration
+        self.baseline = None if baseline is None else np.asarray(baseline, dtype=np.float64)
+        self._linear = None
+
+    def as_matrix(self, rows):
+        """Rows of feature values (in `features` order) as a float matrix."""
+        matrix = np.asarray(rows, dtype=np.float64)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.shape[1] != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} features ({', '.join(self.features)}), got {matrix.shape[1]}")
+        # NaN/inf (or a JSON null) would flow through as a NaN probability
+        if not np.isfinite(matrix).all():
+            raise ValueError("Feature values must be finite numbers")
+        return matrix
+
+    def transform(self, matrix):
+        if self.scaler is None:
+            return matrix
+        if isinstance(self.scaler, StandardScaler):
+            # Same arithmetic as StandardScaler.transform, minus its per-call
+            # validation, which dominates for a single row. mean_ is fitted
+            # even when with_mean is off, so go by the flags
+            if self.scaler.with_mean:
+                matrix = matrix - self.scaler.mean_
+            if self.scaler.with_std:
+                matrix = matrix / self.scaler.scale_
+            return matrix
+        return self.scaler.transform(matrix)
+
+    def predict(self, rows):
+        return self.estimator.predict(self.transform(self.as_matrix(rows)))
+
+    def linear_terms(self):
+        """(coef, intercept) of a binary linear model, or None for other estimators."""
+        if self._linear is None:
+            try:
+                # A linear-kernel SVC rebuilds coef_ from its support vectors on every access
+                coef = np.asarray(self.estimator.coef_, dtype=np.float64).ravel()
+            except AttributeError:
+                self._linear = False
+            else:
+                self._linear = (coef, float(np.ravel(self.estimator.intercept_)[0]))
+        return self._linear or None
+
+    def explain(self, rows):
+        """Labels, positive-class probabilities and per-feature contributions
+        for every row.
+
+        For linear models labels and contributions follow in closed form
+        from the decision value w.x + b: the contributions are
+        w * (x - baseline) in the model's input space, so they sum to the
+        decision value minus that of an average training row. The
+        probability is the Platt sigmoid of the decision value when the
+        artifact carries calibration, the plain sigmoid for logistic
+        regression, else the estimator's own predict_proba, else None: the
+        raw decision value of an uncalibrated SVC is a margin, not a
+        probability. Other models get predict / predict_proba
+        and no contributions.
+        """
+        scaled = self.transform(self.as_matrix(rows))
+        linear = self.linear_terms()
+        if linear is None:
+            probabilities = None
+            if hasattr(self.estimator, 'predict_proba'):
+                probabilities = self.estimator.predict_proba(scaled)[:, 1]
+            return self.estimator.predict(scaled), probabilities, None
+
+        coef, intercept = linear
+        decision = scaled @ coef + intercept
+        if self.calibration:
+            probabilities = expit(-(self.calibration['a'] * decision + self.calibration['b']))
+        elif isinstance(self.estimator, LogisticRegression):
+            # Binary logistic regression's predict_proba is exactly this
+            probabilities = expit(decision)
+        elif hasattr(self.estimator, 'predict_proba'):
+            probabilities = self.estimator.predict_proba(scaled)[:, 1]
+        else:
+            probabilities = None
+        labels = self.estimator.classes_.take((decision > 0).astype(int))
+        centered = scaled if self.baseline is None else scaled - self.baseline
+        return labels, probabilities, centered * coef
+
+    def __repr__(self):
+        return f"<ModelArtifact {self.name} v{self.version}>"
+
+
+def save(name, estimator, scaler, features, metrics=None, calibration=None, baseline=None):
+    """Write a new version of artifact `name` and make it the current one."""
+    directory = artifacts_dir()
+    os.makedirs(directory, exist_ok=True)
+    current = read_manifest(name)
+    version = current['version'] + 1 if current else 1
+    filename = f'{name}-v{version}.joblib'
+    path = os.path.join(directory, filename)
+
+    # Uncompressed, so numpy arrays inside can be memory-mapped on load
+    joblib.dump({
+        'format': ARTIFACT_FORMAT,
+        'name': name,
+        'version': version,
+        'estimator': estimator,
+        'scaler': scaler,
+        'features': list(features),
+        'metrics': metrics or {},
+        'calibration': calibration,
+        'baseline': None if baseline is None else np.asarray(baseline, dtype=np.float64),
+    }, path)
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'name': name,
+        'version': version,
+        'file': filename,
+        'sha256': file_digest(path),
+        'features': list(features),
+        'metrics': metrics or {},
+        'calibration': calibration,
+        'sklearn_version': sklearn.__version__,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    # Replace the manifest atomically: workers never see a half-written one
+    temporary = manifest_path(name) + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temporary, manifest_path(name))
+    return manifest
+
+
+def read_manifest(name):
+    try:
+        with open(manifest_path(name), encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def load(name):
+    """Load the current version of `name` from disk, verifying its checksum."""
+    manifest = read_manifest(name)
+    if manifest is None:
+        raise ImproperlyConfigured(f"No '{name}' model artifact in {artifacts_dir()}; run `manage.py train_models`.")
+    path = os.path.join(artifacts_dir(), manifest['file'])
+    if file_digest(path) != manifest['sha256']:
+        raise ImproperlyConfigured(f"Checksum mismatch for {path}; retrain with `manage.py train_models`.")
+    if manifest.get('sklearn_version') != sklearn.__version__:
+        logger.warning("Model artifact %s was trained with scikit-learn %s, running %s",
+                       manifest['file'], manifest.get('sklearn_version'), sklearn.__version__)
+
+    payload = joblib.load(path, mmap_mode='r')
+    return ModelArtifact(
+        name, manifest['version'], payload['estimator'], payload['scaler'], payload['features'],
+        metrics=manifest.get('metrics'), sha256=manifest['sha256'], created_at=manifest.get('created_at'),
+        calibration=payload.get('calibration'), baseline=payload.get('baseline'),
+    )
+
+
+def train(name, data_dir=None):
+    """Fit artifact `name` from its dataset, in memory only."""
+    trained = import_string(TRAINERS[name])(data_dir or settings.BASE_DIR)
+    return ModelArtifact(name, 0, trained['estimator'], trained['scaler'], trained['features'], trained['metrics'],
+                         calibration=trained.get('calibration'), baseline=trained.get('baseline'))
+
+
+_artifacts = {}
+_lock = threading.RLock()
+
+
+def _install(artifact):
+    with _lock:
+        _artifacts[artifact.name] = artifact
+    logger.info("Loaded model artifact %s v%s", artifact.name, artifact.version)
+    artifact_loaded.send(sender=ModelArtifact, artifact=artifact)
+    return artifact
+
+
+def get(name):
+    """The process-wide artifact for `name`, loaded on first use.
+
+    Without a trained artifact on disk the model is fitted in memory instead,
+    as before, so a fresh checkout keeps working until `train_models` runs.
+    """
+    try:
+        return _artifacts[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name in _artifacts:
+            return _artifacts[name]
+        if read_manifest(name) is None:
+            logger.warning("No '%s' model artifact in %s; training in memory. Run `manage.py train_models`.",
+                           name, artifacts_dir())
+            return _install(train(name))
+        return _install(load(name))
+
+
+def reload(name):
+    return _install(load(name))
+
+
+def preload(name):
+    """Load `name` at startup if an artifact exists; otherwise defer to first use."""
+    if name not in _artifacts and read_manifest(name) is not None:
+        get(name)
@@ -0,0 +1,186 @@
+import codecs
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+# Batch scoring for the artifact classifiers (website.artifacts). A request
+# carries many patient rows as JSON or CSV; they are parsed into one matrix
+# and scored (with probabilities and contributions) in one vectorized pass,
+# then streamed back.
+
+STREAM_CHUNK_ROWS = 1000
+
+
+class BatchError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def max_rows():
+    return getattr(settings, 'PREDICTION_BATCH_MAX_ROWS', 50000)
+
+
+def _check_size(count):
+    if count > max_rows():
+        raise BatchError(f"At most {max_rows()} rows per batch", status=413)
+
+
+def parse_csv(lines, features):
+    """CSV with a header naming every feature (any order); an optional "id"
+    column is echoed back with the results."""
+    reader = csv.reader(lines)
+    header = [name.strip() for name in next(reader, [])]
+    missing = [feature for feature in features if feature not in header]
+    if missing:
+        raise BatchError(f"CSV header is missing: {', '.join(missing)}")
+    columns = [header.index(feature) for feature in features]
+    id_column = header.index('id') if 'id' in header else None
+
+    ids, values = [], []
+    for line, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        if len(row) < len(header):
+            raise BatchError(f"CSV line {line} has {len(row)} of {len(header)} columns")
+        values.append([row[column] for column in columns])
+        if id_column is not None:
+            ids.append(row[id_column])
+        _check_size(len(values))
+    return ids or None, values
+
+
+def parse_json(payload, features):
+    """Either a list of rows or {"rows": [...]}; each row is a list of values
+    in feature order or an object keyed by feature name (plus optional "id")."""
+    rows = payload.get('rows') if isinstance(payload, dict) else payload
+    if not isinstance(rows, list):
+        raise BatchError('Expected a list of rows or {"rows": [...]}')
+    _check_size(len(rows))
+    if rows and isinstance(rows[0], dict):
+        ids, values = [], []
+        for number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                raise BatchError(f"Row {number} is not an object like row 1")
+            try:
+                values.append([row[feature] for feature in features])
+            except KeyError as e:
+                raise BatchError(f"Row {number} is missing feature {e}")
+            ids.append(row.get('id'))
+        return (ids if any(id_ is not None for id_ in ids) else None), values
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, list):
+            raise BatchError(f"Row {number} must be a list of {len(features)} values or an object")
+    return None, rows
+
+
+def parse_request(request, artifact):
+    """Return (format, ids, matrix) for a JSON or CSV request body."""
+    if request.content_type in ('text/csv', 'application/csv'):
+        # Iterating the request reads the body line by line
+        try:
+            ids, values = parse_csv(codecs.iterdecode(request, 'utf-8-sig'), artifact.features)
+        except UnicodeDecodeError:
+            raise BatchError('CSV must be UTF-8')
+        input_format = 'csv'
+    else:
+        try:
+            payload = json.load(request)
+        except ValueError:
+            raise BatchError('Invalid JSON')
+        ids, values = parse_json(payload, artifact.features)
+        input_format = 'json'
+    if not values:
+        raise BatchError('No rows given')
+    try:
+        return input_format, ids, artifact.as_matrix(values)
+    except (TypeError, ValueError) as e:
+        raise BatchError(f"Rows must hold {len(artifact.features)} numeric features: {e}")
+
+
+def _records(ids, artifact, matrix, labels, with_contributions):
+    # One vectorized call scores (and explains) the whole matrix
+    predictions, probabilities, contributions = artifact.explain(matrix)
+    predictions = predictions.astype(int).tolist()
+    if probabilities is not None:
+        probabilities = probabilities.round(4).tolist()
+    if not with_contributions:
+        contributions = None
+    for start in range(0, len(predictions), STREAM_CHUNK_ROWS):
+        block = []
+        for row in range(start, min(start + STREAM_CHUNK_ROWS, len(predictions))):
+            record = {} if ids is None else {'id': ids[row]}
+            record['prediction'] = predictions[row]
+            record['label'] = labels[predictions[row]]
+            if probabilities is not None:
+                record['probability'] = probabilities[row]
+            if contributions is not None:
+                record['contributions'] = dict(zip(artifact.features, contributions[row].round(4).tolist()))
+            block.append(record)
+        yield block
+
+
+def _stream_json(blocks):
+    yield '{"results": ['
+    first = True
+    for block in blocks:
+        text = ', '.join(json.dumps(record) for record in block)
+        yield text if first else ', ' + text
+        first = False
+    yield ']}'
+
+
+def _stream_jsonl(blocks):
+    for block in blocks:
+        yield ''.join(json.dumps(record) + '\n' for record in block)
+
+
+def _flatten(record):
+    contributions = record.pop('contributions', None) or {}
+    record.update((f'contribution_{feature}', value) for feature, value in contributions.items())
+    return record
+
+
+def _stream_csv(blocks):
+    header_written = False
+    for block in blocks:
+        buffer = io.StringIO()
+        # Contributions become one contribution_<feature> column each
+        rows = [_flatten(record) for record in block]
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        if not header_written:
+            writer.writeheader()
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+STREAMS = {
+    'json': (_stream_json, 'application/json'),
+    'jsonl': (_stream_jsonl, 'application/x-ndjson'),
+    'csv': (_stream_csv, 'text/csv'),
+}
+
+
+def predict_response(request, artifact, labels):
+    """Score the rows of a batch request; the output format follows the input
+    (JSON or CSV) unless ?format=json|jsonl|csv asks otherwise, and
+    ?explain=1 adds per-feature contributions."""
+    try:
+        input_format, ids, matrix = parse_request(request, artifact)
+    except BatchError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    output_format = request.GET.get('format', input_format)
+    if output_format not in STREAMS:
+        return JsonResponse({'error': f"Unknown format '{output_format}'"}, status=400)
+
+    with_contributions = request.GET.get('explain') in ('1', 'true')
+    stream, content_type = STREAMS[output_format]
+    response = StreamingHttpResponse(stream(_records(ids, artifact, matrix, labels, with_contributions)),
+                                     content_type=content_type)
+    response['X-Model-Version'] = str(artifact.version)
+    response['X-Row-Count'] = str(len(matrix))
+    return response
@@ -0,0 +1,46 @@
+# website/management/commands/train_models.py
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from website import artifacts
+
+
+class Command(BaseCommand):
+    help = 'Train the diabetes and heart classifiers and write versioned model artifacts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Artifacts to train (default: {', '.join(artifacts.TRAINERS)})")
+        parser.add_argument('--data-dir', default=None, help='Directory holding the training CSVs (default: BASE_DIR)')
+        parser.add_argument('--keep', type=int, default=3, help='Number of versions to keep per artifact')
+
+    def prune(self, name, keep):
+        current = artifacts.read_manifest(name)['version']
+        directory = artifacts.artifacts_dir()
+        prefix = f'{name}-v'
+        for filename in os.listdir(directory):
+            if filename.startswith(prefix) and filename.endswith('.joblib'):
+                version = filename[len(prefix):-len('.joblib')]
+                if version.isdigit() and int(version) <= current - keep:
+                    os.remove(os.path.join(directory, filename))
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(artifacts.TRAINERS)
+        unknown = set(names) - set(artifacts.TRAINERS)
+        if unknown:
+            raise CommandError(f"Unknown artifacts: {', '.join(sorted(unknown))}")
+        data_dir = options['data_dir'] or settings.BASE_DIR
+
+        for name in names:
+            started = time.perf_counter()
+            trained = artifacts.train(name, data_dir)
+            manifest = artifacts.save(name, trained.estimator, trained.scaler, trained.features, trained.metrics,
+                                      calibration=trained.calibration, baseline=trained.baseline)
+            self.prune(name, max(1, options['keep']))
+            self.stdout.write(self.style.SUCCESS(
+                f"{name} v{manifest['version']}: {manifest['file']} sha256={manifest['sha256'][:12]} "
+                f"metrics={manifest['metrics']} in {time.perf_counter() - started:.2f}s"
+            ))
+        self.stdout.write("Restart the web workers to load the new versions.")
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from .artifacts import artifact_loaded
+
+
+class PredictionCache:
+    """
+    LRU cache with a TTL for single-row classifier results and explanations.
+
+    Keys are (model name, model version, normalized feature tuple), so a new
+    artifact version never serves results of the previous one; loading an
+    artifact also drops that model's entries outright.
+    """
+
+    def __init__(self, max_entries=4096, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(artifact, features):
+        # Equal numbers typed differently ("1", 1, 1.0) share an entry
+        return artifact.name, artifact.version, tuple(round(float(value), 6) for value in features)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == name]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PredictionCache(
+                max_entries=getattr(settings, 'PREDICTION_CACHE_MAX_ENTRIES', 4096),
+                ttl=getattr(settings, 'PREDICTION_CACHE_TTL', 300),
+            )
+        return _cache
+
+
+def explain(artifact, features):
+    """Prediction, probability and feature contributions for one row of
+    `features`, cached per model version. Contributions are ordered by size."""
+    cache = get_cache()
+    key = cache.make_key(artifact, features)
+    explanation = cache.get(key)
+    if explanation is None:
+        labels, probabilities, contributions = artifact.explain(features)
+        explanation = {
+            'prediction': int(labels[0]),
+            'probability': None if probabilities is None else round(float(probabilities[0]), 4),
+            'contributions': None if contributions is None else dict(sorted(
+                zip(artifact.features, contributions[0].round(4).tolist()),
+                key=lambda item: abs(item[1]), reverse=True,
+            )),
+        }
+        cache.set(key, explanation)
+    return explanation
+
+
+@receiver(artifact_loaded)
+def _invalidate_on_load(sender, artifact, **kwargs):
+    get_cache().invalidate(artifact.name)
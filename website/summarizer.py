@@ -1,37 +1,186 @@
-from transformers import BartTokenizer, BartForConditionalGeneration
-import PyPDF2
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from django.conf import settings
+from sumapp import chunking, ingest, profiles, registry
+
+# Upper bound on reduce rounds; each round shrinks the text roughly sevenfold
+MAX_REDUCE_ROUNDS = 5
+
+_map_pool = None
+_map_pool_lock = threading.Lock()
 
-# Load BART model and tokenizer
-tokenizer = BartTokenizer.from_pretrained('facebook/bart-large-cnn')
-model = BartForConditionalGeneration.from_pretrained('facebook/bart-large-cnn')
 
 # Function to summarize a single chunk of text
-def summarize_text_chunk(text_chunk):
-    inputs = tokenizer.encode("summarize: " + text_chunk, return_tensors="pt", max_length=1024, truncation=True)
-    summary_ids = model.generate(inputs, max_length=150, min_length=40, length_penalty=2.0, num_beams=4, early_stopping=True)
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-    return summary
-
-# Function to handle large PDFs by chunking long texts
-def summarize_pdf(file_path, chunk_size=1024):
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-
-    # Tokenize and break text into chunks of approximately chunk_size tokens
-    text_chunks = []
-    tokens = tokenizer.encode(text)
-    for i in range(0, len(tokens), chunk_size):
-        chunk_tokens = tokens[i:i + chunk_size]
-        text_chunk = tokenizer.decode(chunk_tokens, skip_special_tokens=True)
-        text_chunks.append(text_chunk)
-
-    # Summarize each chunk and combine the results
-    final_summary = ""
-    for chunk in text_chunks:
-        chunk_summary = summarize_text_chunk(chunk)
-        final_summary += chunk_summary + " "
-    
-    return final_summary.strip()
+def summarize_text_chunk(text_chunk, profile=None):
+    return summarize_chunks([text_chunk], profile=profile)[0]
+
+def _make_batches(lengths, batch_size, max_batch_tokens):
+    # Group chunk indices (shortest first, to keep padding low) so that each
+    # batch has at most batch_size rows and batch_rows * longest_row tokens
+    # stays under max_batch_tokens.
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current = [], []
+    for idx in order:
+        longest = max(lengths[idx], max((lengths[i] for i in current), default=0))
+        if current and (len(current) >= batch_size or (len(current) + 1) * longest > max_batch_tokens):
+            batches.append(current)
+            current = []
+        current.append(idx)
+    if current:
+        batches.append(current)
+    return batches
+
+# Summarize chunks given as token id lists, running model.generate on padded
+# batches. `profile` names a generation profile from SUMMARIZER_PROFILES;
+# `backend` picks a specific inference backend instead of SUMMARIZER_BACKEND;
+# `on_chunk(index, summary)` is called as each chunk summary is decoded.
+def summarize_token_chunks(chunks, batch_size=None, max_batch_tokens=None, progress=None, backend=None,
+                           profile=None, on_chunk=None):
+    if batch_size is None:
+        batch_size = getattr(settings, 'SUMMARIZER_BATCH_SIZE', 4)
+    if max_batch_tokens is None:
+        max_batch_tokens = getattr(settings, 'SUMMARIZER_MAX_BATCH_TOKENS', 8192)
+
+    tokenizer, model = registry.get('bart' if backend is None else f'bart:{backend}')
+    generation_kwargs = profiles.generation_kwargs(profile)
+    summaries = [None] * len(chunks)
+    done = 0
+    for batch in _make_batches([len(ids) for ids in chunks], batch_size, max_batch_tokens):
+        decoded = _generate(tokenizer, model, [chunks[i] for i in batch], generation_kwargs)
+        for idx, summary in zip(batch, decoded):
+            summaries[idx] = summary
+            if on_chunk is not None:
+                on_chunk(idx, summary)
+        done += len(batch)
+        if progress is not None:
+            progress(done, len(chunks))
+    return summaries
+
+def _generate(tokenizer, model, batch_ids, generation_kwargs):
+    inputs = tokenizer.pad({'input_ids': batch_ids}, return_tensors="pt")
+    with torch.inference_mode():
+        summary_ids = model.generate(
+            inputs['input_ids'],
+            attention_mask=inputs['attention_mask'],
+            **generation_kwargs,
+        )
+    return tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+# Summarize several text chunks, each truncated to the model's input size
+def summarize_chunks(text_chunks, batch_size=None, max_batch_tokens=None, progress=None, profile=None):
+    tokenizer, _ = registry.get('bart')
+    chunks = tokenizer(list(text_chunks), max_length=1024, truncation=True)['input_ids']
+    return summarize_token_chunks(chunks, batch_size, max_batch_tokens, progress, profile=profile)
+
+def _get_map_pool():
+    global _map_pool
+    with _map_pool_lock:
+        if _map_pool is None:
+            _map_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SUMMARIZER_MAP_WORKERS', 2),
+                thread_name_prefix='summary-map',
+            )
+        return _map_pool
+
+# Map stage: summarize chunks on the map worker pool, one contiguous slice of
+# chunks per worker, reporting combined progress and each chunk summary
+def map_chunks(chunks, progress=None, profile=None, on_chunk=None):
+    workers = min(getattr(settings, 'SUMMARIZER_MAP_WORKERS', 2), len(chunks))
+    if workers <= 1:
+        return summarize_token_chunks(chunks, progress=progress, profile=profile, on_chunk=on_chunk)
+
+    size = -(-len(chunks) // workers)
+    slices = [chunks[i:i + size] for i in range(0, len(chunks), size)]
+    completed = [0] * len(slices)
+    lock = threading.Lock()
+
+    def slice_progress(index):
+        def report(done, _total):
+            with lock:
+                completed[index] = done
+                if progress is not None:
+                    progress(sum(completed), len(chunks))
+        return report
+
+    def slice_chunk(index):
+        if on_chunk is None:
+            return None
+        return lambda position, summary: on_chunk(index * size + position, summary)
+
+    pool = _get_map_pool()
+    futures = [pool.submit(summarize_token_chunks, part, progress=slice_progress(i), profile=profile,
+                           on_chunk=slice_chunk(i))
+               for i, part in enumerate(slices)]
+    return [summary for future in futures for summary in future.result()]
+
+def resolve_mode(mode):
+    mode = mode or getattr(settings, 'SUMMARIZER_MODE', 'map_reduce')
+    if mode not in ('concat', 'map_reduce'):
+        raise ValueError(f"Unknown summarization mode '{mode}'")
+    return mode
+
+# Reduce stage: summarize the chunk summaries again, round after round, until
+# the combined text fits in target_tokens. `done` chunks have already been
+# summarized; progress(done, total) continues counting from there.
+def reduce_summaries(summaries, target_tokens=None, progress=None, profile=None, done=0):
+    if target_tokens is None:
+        target_tokens = getattr(settings, 'SUMMARIZER_TARGET_TOKENS', 512)
+    tokenizer, _ = registry.get('bart')
+    finished = planned = done
+
+    def report(count, _total):
+        if progress is not None:
+            progress(finished + count, planned)
+
+    text = " ".join(summaries).strip()
+    for _ in range(MAX_REDUCE_ROUNDS):
+        if len(summaries) <= 1 or len(tokenizer(text, add_special_tokens=False)['input_ids']) <= target_tokens:
+            break
+        chunks = list(chunking.iter_token_chunks(summaries, tokenizer))
+        finished = planned
+        planned += len(chunks)
+        summaries = map_chunks(chunks, progress=report, profile=profile)
+        text = " ".join(summaries).strip()
+    return text
+
+# Summarize the chunks of one document. In "concat" mode the chunk summaries
+# are joined as they are; in "map_reduce" mode they are summarized again,
+# round after round, until the result fits in target_tokens. `on_chunk` sees
+# the summary of every document chunk, not those of the reduce rounds.
+def summarize_document(chunks, mode=None, target_tokens=None, progress=None, profile=None, on_chunk=None):
+    concat = resolve_mode(mode) == 'concat'
+    run = summarize_token_chunks if concat else map_chunks
+    if on_chunk is not None and len(chunks) > 1:
+        # Summarize the first chunk alone so a streaming reader sees output
+        # after one generate call rather than after a whole batch
+        summaries = summarize_token_chunks(chunks[:1], profile=profile, on_chunk=on_chunk)
+        if progress is not None:
+            progress(1, len(chunks))
+        summaries += run(
+            chunks[1:],
+            progress=None if progress is None else lambda done, _total: progress(done + 1, len(chunks)),
+            profile=profile,
+            on_chunk=lambda index, summary: on_chunk(index + 1, summary),
+        )
+    else:
+        summaries = run(chunks, progress=progress, profile=profile, on_chunk=on_chunk)
+
+    if concat:
+        return " ".join(summaries).strip()
+    return reduce_summaries(summaries, target_tokens, progress, profile, done=len(chunks))
+
+# Read a PDF and cut it into model-ready token id chunks
+def chunk_pdf(pdf_file, chunk_size=1024):
+    tokenizer, _ = registry.get('bart')
+    overlap = getattr(settings, 'SUMMARIZER_CHUNK_OVERLAP', 0)
+    return list(chunking.iter_token_chunks(ingest.iter_pages(pdf_file), tokenizer, chunk_size, overlap))
+
+# Function to handle large PDFs by chunking long texts.
+# `pdf_file` is an UploadedFile, a path or the PDF bytes; `progress(done, total)`
+# is called as chunks are summarized, and `on_chunk(index, summary)` with each
+# chunk summary.
+def summarize_pdf(pdf_file, chunk_size=1024, progress=None, mode=None, profile=None, on_chunk=None):
+    return summarize_document(chunk_pdf(pdf_file, chunk_size), mode=mode, progress=progress, profile=profile,
+                              on_chunk=on_chunk)
@@ -19,5 +19,6 @@ urlpatterns = [
     path('user_dashboard/', views.user_dashboard, name='dashboard'),
     path('ai_usecase/<uuid:id>/', views.ai_usecase_detail, name='ai_usecase_detail'),
     path('text_summarization/', views.text_summarization, name='text_summarization'),
+    path('predictions/metrics/', views.prediction_metrics, name='prediction_metrics'),
   
 ]
@@ -5,21 +5,17 @@ from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.core.files.storage import FileSystemStorage
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.conf import settings
-from django.core.files.storage import default_storage
 import json
 import requests
 from geopy.geocoders import Nominatim
 from io import BytesIO
-import PyPDF2
-from transformers import BartTokenizer, BartForConditionalGeneration
 from .models import AIUseCase
+from . import prediction_cache
 from sumapp.forms import UploadFileForm
-from sumapp.utils import extract_text_from_pdf, preprocess_text, extract_key_points, summarize_text
-from .summarizer import summarize_pdf  
+from sumapp import jobs
 from django.core.exceptions import ValidationError
 
 # Custom JSON Encoder for datetime
@@ -147,20 +143,11 @@ def user_dashboard(request):
         form = UploadFileForm(request.POST, request.FILES)
         if form.is_valid():
             try:
-                pdf_file = request.FILES['pdf_file']
-                fs = FileSystemStorage()
-                filename = fs.save(pdf_file.name, pdf_file)
-                file_path = fs.path(filename)
-                
-                summary = summarize_pdf(file_path)
-                key_points = extract_key_points(summary)
-                
-                fs.delete(filename)
-                
+                job = jobs.enqueue(request.FILES['pdf_file'], request.user, form.cleaned_data['profile'])
+
                 context = {
                     'form': form,
-                    'summary': summary,
-                    'key_points': key_points,
+                    'job_id': job.id,
                     'username': request.user.get_full_name(),
                     'email': request.user.email,
                     'date_joined': request.user.date_joined,
@@ -187,20 +174,11 @@ def text_summarization(request):
         form = UploadFileForm(request.POST, request.FILES)
         if form.is_valid():
             try:
-                pdf_file = request.FILES['pdf_file']
-                fs = FileSystemStorage()
-                filename = fs.save(pdf_file.name, pdf_file)
-                file_path = fs.path(filename)
-                
-                summary = summarize_pdf(file_path)
-                key_points = extract_key_points(summary)
-                
-                fs.delete(filename)
-                
+                job = jobs.enqueue(request.FILES['pdf_file'], request.user, form.cleaned_data['profile'])
+
                 context = {
                     'form': form,
-                    'summary': summary,
-                    'key_points': key_points,
+                    'job_id': job.id,
                 }
                 return render(request, 'User/text_sum.html', context)
             except Exception as e:
@@ -308,3 +286,8 @@ def find_hospital(request):
         except json.JSONDecodeError:
             return JsonResponse({'success': False, 'message': 'Invalid JSON data.'})
     return JsonResponse({'success': False, 'message': 'Invalid request method.'})
+
+def prediction_metrics(request):
+    # Hit/miss counters of this worker process's single-row prediction cache
+    cache = prediction_cache.get_cache()
+    return JsonResponse({'max_entries': cache.max_entries, 'ttl': cache.ttl, **cache.stats()})